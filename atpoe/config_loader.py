@@ -6,14 +6,32 @@ Provides validation and type checking for configuration settings.
 
 import yaml
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from pathlib import Path
+from functools import cached_property
 
+try:
+    # LibYAML-backed loader is much faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-@dataclass
+# Allowed values for the enumerated settings
+_CIRCLE_STYLES = frozenset({"solid", "dashed", "dotted", "dash-dot"})
+_ANTIALIASING_QUALITIES = frozenset({"low", "medium", "high"})
+_TANGENT_METHODS = frozenset({"3_point_average", "simple", "weighted"})
+_LINE_JOINS = frozenset({"round", "bevel", "miter"})
+_LINE_CAPS = frozenset({"round", "square", "butt"})
+_OUTPUT_FORMATS = frozenset({"png", "jpg", "svg"})
+
+
+# Config sections are frozen and slotted; __slots__ is spelled out as
+# dataclass(slots=True) needs Python 3.10
+@dataclass(frozen=True)
 class InitialCircleConfig:
     """Configuration for the initial circle."""
+    __slots__ = ('color', 'width', 'style', 'visible')
+    
     color: str
     width: int
     style: str
@@ -23,32 +41,38 @@ class InitialCircleConfig:
         """Validate initial circle configuration."""
         if self.width < 1 or self.width > 20:
             raise ValueError("Initial circle width must be between 1 and 20")
-        if self.style not in ["solid", "dashed", "dotted", "dash-dot"]:
+        if self.style not in _CIRCLE_STYLES:
             raise ValueError("Initial circle style must be one of: solid, dashed, dotted, dash-dot")
 
 
-@dataclass
+@dataclass(frozen=True)
 class BackgroundConfig:
     """Configuration for background settings."""
+    __slots__ = ('color', 'fill_enabled')
+    
     color: str
     fill_enabled: bool
 
 
-@dataclass
+@dataclass(frozen=True)
 class AntialiasingConfig:
     """Configuration for antialiasing settings."""
+    __slots__ = ('enabled', 'quality')
+    
     enabled: bool
     quality: str
     
     def __post_init__(self):
         """Validate antialiasing configuration."""
-        if self.quality not in ["low", "medium", "high"]:
+        if self.quality not in _ANTIALIASING_QUALITIES:
             raise ValueError("Antialiasing quality must be one of: low, medium, high")
 
 
-@dataclass
+@dataclass(frozen=True)
 class SegmentLengthConfig:
     """Configuration for segment length settings."""
+    __slots__ = ('scale_factor', 'min_value', 'max_value')
+    
     scale_factor: float
     min_value: int
     max_value: int
@@ -63,9 +87,11 @@ class SegmentLengthConfig:
             raise ValueError("Min value must be less than max value")
 
 
-@dataclass
+@dataclass(frozen=True)
 class CurveGenerationConfig:
     """Configuration for curve generation settings."""
+    __slots__ = ('tangent_method', 'sharp_point_threshold', 'linear_extension_length', 'parallel_tracking_distance')
+    
     tangent_method: str
     sharp_point_threshold: float
     linear_extension_length: float
@@ -73,7 +99,7 @@ class CurveGenerationConfig:
     
     def __post_init__(self):
         """Validate curve generation configuration."""
-        if self.tangent_method not in ["3_point_average", "simple", "weighted"]:
+        if self.tangent_method not in _TANGENT_METHODS:
             raise ValueError("Tangent method must be one of: 3_point_average, simple, weighted")
         if self.sharp_point_threshold < 0 or self.sharp_point_threshold > 180:
             raise ValueError("Sharp point threshold must be between 0 and 180 degrees")
@@ -83,38 +109,44 @@ class CurveGenerationConfig:
             raise ValueError("Parallel tracking distance must be between 0 and 50 pixels")
 
 
-@dataclass
+@dataclass(frozen=True)
 class DrawingConfig:
     """Configuration for drawing settings."""
+    __slots__ = ('line_join', 'line_cap')
+    
     line_join: str
     line_cap: str
     
     def __post_init__(self):
         """Validate drawing configuration."""
-        if self.line_join not in ["round", "bevel", "miter"]:
+        if self.line_join not in _LINE_JOINS:
             raise ValueError("Line join must be one of: round, bevel, miter")
-        if self.line_cap not in ["round", "square", "butt"]:
+        if self.line_cap not in _LINE_CAPS:
             raise ValueError("Line cap must be one of: round, square, butt")
 
 
-@dataclass
+@dataclass(frozen=True)
 class GraphicsBundleConfig:
     """Configuration for graphics bundle settings."""
+    __slots__ = ('default_bundle', 'save_custom_bundles', 'bundle_storage_path')
+    
     default_bundle: str
     save_custom_bundles: bool
     bundle_storage_path: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class OutputConfig:
     """Configuration for output settings."""
+    __slots__ = ('format', 'quality', 'dpi')
+    
     format: str
     quality: int
     dpi: int
     
     def __post_init__(self):
         """Validate output configuration."""
-        if self.format not in ["png", "jpg", "svg"]:
+        if self.format not in _OUTPUT_FORMATS:
             raise ValueError("Output format must be one of: png, jpg, svg")
         if self.quality < 1 or self.quality > 100:
             raise ValueError("Output quality must be between 1 and 100")
@@ -122,34 +154,90 @@ class OutputConfig:
             raise ValueError("DPI must be between 72 and 600")
 
 
+def _construct_trusted(section_cls, values: Dict[str, Any]):
+    """Build a config section from already-validated values, bypassing __post_init__."""
+    section = section_cls.__new__(section_cls)
+    for name, value in values.items():
+        object.__setattr__(section, name, value)
+    return section
+
+
+# Config attribute name and dataclass for each top-level YAML section
+_SECTIONS = (
+    ('initial_circle', InitialCircleConfig),
+    ('background', BackgroundConfig),
+    ('antialiasing', AntialiasingConfig),
+    ('segment_length', SegmentLengthConfig),
+    ('curve_generation', CurveGenerationConfig),
+    ('drawing', DrawingConfig),
+    ('graphics_bundle', GraphicsBundleConfig),
+    ('output', OutputConfig),
+)
+
+
 class Config:
     """Main configuration class with validation."""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        """Initialize configuration from YAML file."""
+    def __init__(self, config_path: str = "config.yaml", allow_default: bool = False):
+        """Initialize configuration from YAML file, falling back to the defaults if allowed."""
         self.config_path = config_path
+        self.allow_default = allow_default
+        self._mtime = None
         self._load_config()
     
+    @classmethod
+    def _construct_trusted(cls, config_data: Dict[str, Any], config_path: Optional[str] = None) -> "Config":
+        """Build a Config from already-validated data without reading or validating it."""
+        config = cls.__new__(cls)
+        config.config_path = config_path
+        config.allow_default = False
+        config._mtime = None
+        config._set_sections(config_data, trusted=True)
+        return config
+    
     def _load_config(self):
         """Load and validate configuration from YAML file."""
         if not os.path.exists(self.config_path):
+            if self.allow_default:
+                self._use_default_sections()
+                return
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
-        with open(self.config_path, 'r') as file:
-            config_data = yaml.safe_load(file)
+        mtime = os.stat(self.config_path).st_mtime_ns
+        with open(self.config_path, 'rb') as file:
+            config_data = yaml.load(file, Loader=SafeLoader)
         
-        # Load and validate each section
-        self.initial_circle = InitialCircleConfig(**config_data.get('initial_circle', {}))
-        self.background = BackgroundConfig(**config_data.get('background', {}))
-        self.antialiasing = AntialiasingConfig(**config_data.get('antialiasing', {}))
-        self.segment_length = SegmentLengthConfig(**config_data.get('segment_length', {}))
-        self.curve_generation = CurveGenerationConfig(**config_data.get('curve_generation', {}))
-        self.drawing = DrawingConfig(**config_data.get('drawing', {}))
-        self.graphics_bundle = GraphicsBundleConfig(**config_data.get('graphics_bundle', {}))
-        self.output = OutputConfig(**config_data.get('output', {}))
+        self._set_sections(config_data)
+        self._mtime = mtime
+    
+    def _set_sections(self, config_data: Dict[str, Any], trusted: bool = False):
+        """Load each section, validating it unless the data is trusted (only the built-in defaults are)."""
+        for name, section_cls in _SECTIONS:
+            values = config_data.get(name, {})
+            if trusted:
+                section = _construct_trusted(section_cls, values)
+            else:
+                section = section_cls(**values)
+            setattr(self, name, section)
+        # Drop derived values cached from the previous sections
+        self.__dict__.pop('segment_length_range', None)
+    
+    def _use_default_sections(self):
+        """Share the already-built sections of the default configuration."""
+        for name, _ in _SECTIONS:
+            setattr(self, name, getattr(_DEFAULT_CONFIG_OBJ, name))
+        self.__dict__.pop('segment_length_range', None)
+        self._mtime = None
+    
+    @cached_property
+    def segment_length_range(self) -> Tuple[int, int]:
+        """Segment length min/max range, cached until the sections are reloaded."""
+        return (self.segment_length.min_value, self.segment_length.max_value)
     
     def reload(self):
-        """Reload configuration from file."""
+        """Reload configuration from file, unless it is unchanged since the last load."""
+        if os.path.exists(self.config_path) and os.stat(self.config_path).st_mtime_ns == self._mtime:
+            return
         self._load_config()
     
     def get_initial_circle_color(self) -> str:
@@ -190,7 +278,7 @@ class Config:
     
     def get_segment_length_range(self) -> tuple:
         """Get segment length min/max range."""
-        return (self.segment_length.min_value, self.segment_length.max_value)
+        return self.segment_length_range
     
     def get_tangent_method(self) -> str:
         """Get tangent calculation method."""
@@ -241,9 +329,24 @@ class Config:
         return self.output.dpi
 
 
-def load_config(config_path: str = "config.yaml") -> Config:
-    """Convenience function to load configuration."""
-    return Config(config_path)
+# Loaded configurations keyed by (path, mtime_ns); an edited file gets a new key
+_CONFIG_CACHE: Dict[Tuple[str, int], Config] = {}
+
+
+def load_config(config_path: str = "config.yaml", allow_default: bool = False) -> Config:
+    """Convenience function to load configuration, reusing it while the file is unchanged."""
+    try:
+        key = (config_path, os.stat(config_path).st_mtime_ns)
+    except FileNotFoundError:
+        if allow_default:
+            return Config(config_path, allow_default=True)
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        config = Config(config_path)
+        _CONFIG_CACHE[key] = config
+    return config
 
 
 # Default configuration values for fallback
@@ -267,6 +370,12 @@ DEFAULT_CONFIG = {
         'min_value': 3,
         'max_value': 30
     },
+    'curve_generation': {
+        'tangent_method': '3_point_average',
+        'sharp_point_threshold': 45.0,
+        'linear_extension_length': 10.0,
+        'parallel_tracking_distance': 8.0
+    },
     'drawing': {
         'line_join': 'round',
         'line_cap': 'round'
@@ -282,3 +391,6 @@ DEFAULT_CONFIG = {
         'dpi': 300
     }
 }
+
+# Fallback configuration built once from DEFAULT_CONFIG; its sections are frozen, so it is shared
+_DEFAULT_CONFIG_OBJ = Config._construct_trusted(DEFAULT_CONFIG)
@@ -1,11 +1,13 @@
-import streamlit as st
+import functools
 import math
-import random
-from PIL import Image, ImageDraw
-import io
+import numpy as np
 from atpoe.config_loader import load_config
+from atpoe.utils.jit import njit
 # from tests.test_fog_polygon_generation import Point2D
 
+# Shared generator for curve noise, reused across calls
+_rng = np.random.default_rng()
+
 
 # Simple graphics bundle system
 class SimpleGraphicsBundle:
@@ -13,6 +15,12 @@ class SimpleGraphicsBundle:
         self.name = name
         self.color = color
         self.width = width
+    
+    @functools.cached_property
+    def rgb(self):
+        """Colour as an RGB tuple, parsed once from the hex string."""
+        hex_color = self.color.lstrip('#')
+        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 # def generate_initial_circle(center: Point2D, radius: float, num_points: int = 50):
 #     """Generate initial circular curve with fewer points to prevent hanging."""
@@ -31,120 +39,117 @@ def generate_nested_curve_simple(outer_curve, distance: float, error: float, min
     
     Date: 2024-12-19
     Description: Generate closed curve with config-validated segment length control and closure handling.
+    Returns an (N, 2) float32 array of points.
     """
     # Load configuration and validate segment length
     config = load_config()
-    min_len, max_len = config.get_segment_length_range()
+    min_len, max_len = config.segment_length_range
     
     if not (min_len <= segment_length <= max_len):
         raise ValueError(f"Segment length {segment_length} outside config range {min_len}-{max_len}")
-    if not outer_curve or len(outer_curve) < 3:
-        return []
+    if outer_curve is None or len(outer_curve) < 3:
+        return np.empty((0, 2), dtype=np.float32)
     
-    # Calculate center of outer curve
-    center_x = sum(p[0] for p in outer_curve) / len(outer_curve)
-    center_y = sum(p[1] for p in outer_curve) / len(outer_curve)
+    pts = np.asarray(outer_curve, dtype=np.float64)
+    n = len(pts)
     
-    new_curve = []
-    current_point = outer_curve[0]  # Start with first point
+    # Unit direction from the centre of the outer curve to each point
+    dirs = pts - pts.mean(axis=0)
+    lengths = np.hypot(dirs[:, 0], dirs[:, 1])[:, None]
+    dirs /= np.where(lengths > 0, lengths, 1.0)
     
-    for i, point in enumerate(outer_curve):
-        # Calculate direction from center to point
-        dx = point[0] - center_x
-        dy = point[1] - center_y
-        
-        # Normalize direction vector
-        length = math.sqrt(dx*dx + dy*dy)
-        if length > 0:
-            dx /= length
-            dy /= length
-        
-        # Move point inward by distance, ensuring minimum separation
-        move_distance = max(distance, min_separation)
-        new_x = point[0] - dx * move_distance
-        new_y = point[1] - dy * move_distance
-        
-        # Add random error (but less for first and last points to ensure closure)
-        if i == 0 or i == len(outer_curve) - 1:
-            error_x = random.uniform(-error * 0.2, error * 0.2)
-            error_y = random.uniform(-error * 0.2, error * 0.2)
-        else:
-            error_x = random.uniform(-error, error)
-            error_y = random.uniform(-error, error)
-        
-        new_point = (new_x + error_x, new_y + error_y)
-        
-        # Check if this point is at proper segment length from current point
-        if i > 0:
-            current_distance = math.sqrt((new_point[0] - current_point[0])**2 + (new_point[1] - current_point[1])**2)
-            if current_distance > segment_length * 1.5:  # Allow some flexibility
-                # Interpolate to maintain segment length
-                ratio = segment_length / current_distance
-                new_point = (
-                    current_point[0] + (new_point[0] - current_point[0]) * ratio,
-                    current_point[1] + (new_point[1] - current_point[1]) * ratio
-                )
-        
-        new_curve.append(new_point)
-        current_point = new_point
+    # Move points inward by distance, ensuring minimum separation
+    move_distance = max(distance, min_separation)
+    new_pts = pts - dirs * move_distance
+    
+    # Add random error (but less for first and last points to ensure closure)
+    noise = _rng.uniform(-error, error, size=(n, 2))
+    noise[0] *= 0.2
+    noise[-1] *= 0.2
+    new_pts += noise
+    
+    _clamp_segments(new_pts, segment_length)
     
     # RULE 1: Ensure the curve closes without gaps
-    if len(new_curve) > 2:
-        # Check distance from last to first point
-        last_to_first_distance = math.sqrt(
-            (new_curve[-1][0] - new_curve[0][0])**2 + 
-            (new_curve[-1][1] - new_curve[0][1])**2
+    # Check distance from last to first point
+    gap_x = new_pts[-1, 0] - new_pts[0, 0]
+    gap_y = new_pts[-1, 1] - new_pts[0, 1]
+    
+    if gap_x*gap_x + gap_y*gap_y <= (segment_length * 1.2)**2:  # Close enough to close
+        # Force the last point to be exactly the same as the first point
+        new_pts[-1] = new_pts[0]
+    else:
+        # Add intermediate points to close properly
+        gap_points, last_to_first_distance = _closure_gap_points(
+            new_pts[-1, 0], new_pts[-1, 1], new_pts[0, 0], new_pts[0, 1], segment_length
         )
+        new_pts = np.concatenate((new_pts, gap_points))
         
-        if last_to_first_distance <= segment_length * 1.2:  # Close enough to close
-            # Force the last point to be exactly the same as the first point
-            new_curve[-1] = new_curve[0]
-        else:
-            # Add intermediate points to close properly
-            while last_to_first_distance > segment_length:
-                # Add point at segment length from last point towards first
-                dx = new_curve[0][0] - new_curve[-1][0]
-                dy = new_curve[0][1] - new_curve[-1][1]
-                length = math.sqrt(dx*dx + dy*dy)
-                if length > 0:
-                    ratio = segment_length / length
-                    new_point = (
-                        new_curve[-1][0] + dx * ratio,
-                        new_curve[-1][1] + dy * ratio
-                    )
-                    new_curve.append(new_point)
-                    last_to_first_distance = math.sqrt(
-                        (new_point[0] - new_curve[0][0])**2 + 
-                        (new_point[1] - new_curve[0][1])**2
-                    )
-                else:
-                    break
-            
-            # Final closure
-            if last_to_first_distance <= segment_length * 1.2:
-                new_curve[-1] = new_curve[0]
+        # Final closure
+        if last_to_first_distance <= segment_length * 1.2:
+            new_pts[-1] = new_pts[0]
+    
+    return new_pts.astype(np.float32)
+
+@njit(cache=True)
+def _clamp_segments(new_pts, segment_length: float):
+    """
+    Pull back any point that lies too far from its predecessor.
+    
+    Date: 2026-10-15
+    Description: Sequential in-place segment length clamp over an (N, 2) point array.
+    """
+    max_distance_sq = (segment_length * 1.5)**2  # Allow some flexibility
+    for i in range(1, len(new_pts)):
+        dx = new_pts[i, 0] - new_pts[i - 1, 0]
+        dy = new_pts[i, 1] - new_pts[i - 1, 1]
+        if dx*dx + dy*dy > max_distance_sq:
+            # Interpolate to maintain segment length
+            ratio = segment_length / math.hypot(dx, dy)
+            new_pts[i, 0] = new_pts[i - 1, 0] + dx * ratio
+            new_pts[i, 1] = new_pts[i - 1, 1] + dy * ratio
+
+@njit(cache=True)
+def _closure_gap_points(last_x: float, last_y: float, first_x: float, first_y: float, segment_length: float):
+    """
+    Fill the gap between the last and first points of a curve.
     
-    return new_curve
+    Date: 2026-10-15
+    Description: Step from last towards first by segment_length, returning the new points and the remaining gap.
+    """
+    dx = first_x - last_x
+    dy = first_y - last_y
+    gap = math.hypot(dx, dy)
+    points = np.empty((int(gap / segment_length) + 1, 2))
+    count = 0
+    x, y = last_x, last_y
+    while gap > segment_length and count < points.shape[0]:
+        # Add point at segment length from last point towards first
+        ratio = segment_length / gap
+        x += dx * ratio
+        y += dy * ratio
+        points[count, 0] = x
+        points[count, 1] = y
+        count += 1
+        dx = first_x - x
+        dy = first_y - y
+        gap = math.hypot(dx, dy)
+    return points[:count], gap
 
 def check_curve_inside_outer(inner_curve, outer_curve):
     """Check if inner curve is completely inside outer curve."""
-    if not inner_curve or not outer_curve:
+    if len(inner_curve) == 0 or len(outer_curve) == 0:
         return False
     
-    # Calculate center of outer curve
-    outer_center_x = sum(p[0] for p in outer_curve) / len(outer_curve)
-    outer_center_y = sum(p[1] for p in outer_curve) / len(outer_curve)
-    
-    # Calculate radius of outer curve
-    outer_radius = max(math.hypot(p[0] - outer_center_x, p[1] - outer_center_y) for p in outer_curve)
+    # Centre and squared radius of the outer curve
+    outer = np.asarray(outer_curve, dtype=np.float64)
+    outer_center = outer.mean(axis=0)
+    outer_radius_sq = ((outer - outer_center)**2).sum(axis=1).max()
     
     # Check if all points of inner curve are inside outer curve
-    for point in inner_curve:
-        distance_from_center = math.hypot(point[0] - outer_center_x, point[1] - outer_center_y)
-        if distance_from_center >= outer_radius:
-            return False
-    
-    return True
+    inner = np.asarray(inner_curve, dtype=np.float64)
+    distance_sq = ((inner - outer_center)**2).sum(axis=1)
+    return bool((distance_sq < outer_radius_sq).all())
 
 def draw_curves_simple(draw, curves, bundle):
     """
@@ -156,25 +161,23 @@ def draw_curves_simple(draw, curves, bundle):
     if not curves:
         return
     
-    # Convert hex color to RGB
-    def hex_to_rgb(hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    
-    color = hex_to_rgb(bundle.color)
+    color = bundle.rgb
+    width = int(bundle.width)
     
     # Draw each curve
     for curve in curves:
         if len(curve) < 2:
             continue
             
-        # Draw line segments
-        for i in range(len(curve) - 1):
-            start_point = curve[i]
-            end_point = curve[i + 1]
-            draw.line([start_point, end_point], fill=color, width=int(bundle.width))
+        # Draw the whole curve as one polyline, with rounded joints on thick lines
+        draw.line(np.asarray(curve).ravel().tolist(), fill=color, width=width, joint='curve' if width > 1 else None)
 
 def main():
+    # UI-only imports are deferred so the curve functions import cheaply outside Streamlit
+    import io
+    import streamlit as st
+    from PIL import Image, ImageDraw
+    
     st.set_page_config(page_title="AtPoE - Multi-Bundle Stable", page_icon="🎨", layout="wide")
     st.title("🎨 AtPoE - Multi-Bundle Interactive Curve Generator")
     st.markdown("Generate curves with different graphics bundles interactively")
@@ -184,6 +187,8 @@ def main():
         st.session_state.all_curves = []
     if 'current_image' not in st.session_state:
         st.session_state.current_image = None
+    if 'current_draw' not in st.session_state:
+        st.session_state.current_draw = None
     if 'bundle_history' not in st.session_state:
         st.session_state.bundle_history = []
     
@@ -221,7 +226,7 @@ def main():
         curve_distance = st.slider("Curve Separation", 0.0, 15.0, 8.0, 0.1, key="distance_slider")
         # Load config for segment length constraints
         config = load_config()
-        min_len, max_len = config.get_segment_length_range()
+        min_len, max_len = config.segment_length_range
         segment_length = st.slider("Segment Length", float(min_len), float(max_len), 3.0, 0.1, key="segment_slider")
         min_inter_curve = st.slider("Minimum Inter-Curve", 1.0, 4.0, 1.0, 0.1, key="inter_curve_slider")
         canvas_size = st.selectbox("Canvas Size", [800, 1000, 1200, 1500], index=1, key="canvas_slider")
@@ -262,13 +267,17 @@ def main():
                 if st.session_state.current_image is None:
                     image = Image.new('RGB', (canvas_size, canvas_size), 'white')
                     draw = ImageDraw.Draw(image)
+                    st.session_state.current_draw = draw
                     # Start with outer circle for first bundle
                     radius = min(canvas_size / 2 - 50, 300)
                     start_curve = generate_initial_circle(center_x, center_y, radius)
                 else:
                     # Load existing image
                     image = st.session_state.current_image
-                    draw = ImageDraw.Draw(image)
+                    draw = st.session_state.current_draw
+                    if draw is None:
+                        draw = ImageDraw.Draw(image)
+                        st.session_state.current_draw = draw
                     # Continue from the last curve of the previous bundle
                     if st.session_state.all_curves:
                         last_bundle_curves = st.session_state.all_curves[-1]
@@ -300,7 +309,7 @@ def main():
                         )
                     
                     # RULE 3: Ensure curve is inside existing curves without overlap
-                    if curve:
+                    if len(curve):
                         # Check if this curve is inside the previous curve
                         if i == 0 and st.session_state.all_curves:
                             # For first curve of new bundle, check against last curve of previous bundle
@@ -318,7 +327,7 @@ def main():
                                     bundle_curves[i-1], min_inter_curve, error_level * 0.5, min_inter_curve
                                 )
                         
-                        if curve:
+                        if len(curve):
                             bundle_curves.append(curve)
                 
                 # Draw curves with current bundle
@@ -337,6 +346,7 @@ def main():
         elif clear_all_clicked:
             st.session_state.all_curves = []
             st.session_state.current_image = None
+            st.session_state.current_draw = None
             st.session_state.bundle_history = []
             st.info("🗑️ All curves cleared!")
         
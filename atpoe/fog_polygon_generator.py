@@ -5,30 +5,298 @@ Description: Fog-based polygon generation system for creating nested polygons
 import logging
 import math
 import time
+from collections import deque
 from typing import List, Tuple, Optional
 from pathlib import Path
 
+import numpy as np
+
+from atpoe.utils.geometric_utils import _pip_many_numba, _pip_numba, _segments_intersect_numba
+from atpoe.utils.jit import NUMBA_AVAILABLE, njit
+
 try:
+    import shapely
     from shapely.geometry import Point, Polygon, LineString
     from shapely.ops import unary_union
-    SHAPELY_AVAILABLE = True
+    # The vectorized functions used here (contains_xy, points, distance, prepare, STRtree predicates) are Shapely 2 only
+    SHAPELY_AVAILABLE = hasattr(shapely, "contains_xy")
 except ImportError:
     SHAPELY_AVAILABLE = False
-    print("Warning: Shapely not available, using fallback geometry")
+if not SHAPELY_AVAILABLE:
+    print("Warning: Shapely 2 not available, using fallback geometry")
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Per-iteration diagnostic prints; off by default as formatting them costs more than the geometry
+_DEBUG = False
+
 CLOSURE_THRESHOLD = 3
 MIN_POINTS = 10 # growing curve must have at least these many points
 MAX_ITERATIONS = 5000  # Prevent infinite loops
 
+# Candidate step directions for the fixed angle sets, as (angle in degrees, cos, sin)
+_DIRECTIONS_15 = tuple((angle, math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+                       for angle in range(0, 360, 15))
+_DIRECTIONS_30 = tuple((angle, math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+                       for angle in range(0, 360, 30))
+_TURN_ADJUSTMENTS = tuple((angle, math.cos(math.radians(angle)), math.sin(math.radians(angle)))
+                          for angle in (0, 5, -5, 10, -10, 15, -15))
+_COS_15 = np.array([cos for _, cos, _ in _DIRECTIONS_15])
+_SIN_15 = np.array([sin for _, _, sin in _DIRECTIONS_15])
+_COS_30 = np.array([cos for _, cos, _ in _DIRECTIONS_30])
+_SIN_30 = np.array([sin for _, _, sin in _DIRECTIONS_30])
+_TURN_ANGLES = np.array([angle for angle, _, _ in _TURN_ADJUSTMENTS], dtype=np.float64)
+_TURN_COS = np.array([cos for _, cos, _ in _TURN_ADJUSTMENTS])
+_TURN_SIN = np.array([sin for _, _, sin in _TURN_ADJUSTMENTS])
+
+# Per-polygon derived data keyed by id(polygon); the polygon itself is kept so its id cannot be reused
+_POLYGON_ARRAYS = {}
+_POLYGON_EDGES = {}
+_BOUNDARY_TREES = {}
+_VERTEX_TREES = {}
+_SHAPELY_POLYGONS = {}
+POLYGON_CACHE_SIZE = 64
+
+
+def _cached_for_polygon(cache: dict, polygon: List[Tuple[float, float]], build):
+    """
+    Date: 2026-10-15
+    Description: Return build(polygon), computed once per polygon object.
+    Polygons are treated as immutable once passed in
+    """
+    cached = cache.get(id(polygon))
+    if cached is not None and cached[0] is polygon:
+        return cached[1]
+    
+    value = build(polygon)
+    if len(cache) >= POLYGON_CACHE_SIZE:
+        cache.clear()
+    cache[id(polygon)] = (polygon, value)
+    return value
+
+
+def _polygon_array(polygon: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Date: 2026-10-15
+    Description: Return the polygon as a contiguous (n, 2) float64 array, converted once per polygon
+    """
+    return _cached_for_polygon(_POLYGON_ARRAYS, polygon,
+                               lambda poly: np.ascontiguousarray(poly, dtype=np.float64))
+
+
+def _clear_polygon_caches():
+    """
+    Date: 2026-10-15
+    Description: Drop all per-polygon cached data
+    """
+    for cache in (_POLYGON_ARRAYS, _POLYGON_EDGES, _BOUNDARY_TREES, _VERTEX_TREES, _SHAPELY_POLYGONS):
+        cache.clear()
+
+
+def _build_shapely_polygon(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Build a prepared Shapely Polygon, so contains/intersects use its edge index
+    """
+    prepared = Polygon(polygon)
+    shapely.prepare(prepared)
+    return prepared
+
+
+def shapely_polygon(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Return the cached prepared Shapely Polygon for a polygon; needs Shapely 2 (SHAPELY_AVAILABLE)
+    """
+    return _cached_for_polygon(_SHAPELY_POLYGONS, polygon, _build_shapely_polygon)
+
+
+def _vertex_tree(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Return the cached KD-tree over the vertices of a polygon
+    """
+    return _cached_for_polygon(_VERTEX_TREES, polygon, lambda poly: cKDTree(_polygon_array(poly)))
+
+
+def _build_polygon_edges(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Split a polygon into edge arrays (xs, ys, dxs, dys, inv_len2, exmin, exmax, eymin, eymax),
+    edge i running from vertex i to vertex i + 1; inv_len2 is 0 for zero-length edges and the
+    last four are the edge bounding boxes
+    """
+    poly_xy = _polygon_array(polygon)
+    xs = np.ascontiguousarray(poly_xy[:, 0])
+    ys = np.ascontiguousarray(poly_xy[:, 1])
+    dxs = np.roll(xs, -1) - xs
+    dys = np.roll(ys, -1) - ys
+    len2 = dxs * dxs + dys * dys
+    inv_len2 = np.divide(1.0, len2, out=np.zeros_like(len2), where=len2 > 0)
+    next_xs = np.roll(xs, -1)
+    next_ys = np.roll(ys, -1)
+    return (xs, ys, dxs, dys, inv_len2,
+            np.minimum(xs, next_xs), np.maximum(xs, next_xs), np.minimum(ys, next_ys), np.maximum(ys, next_ys))
+
+
+def _polygon_edges(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Return the cached edge arrays for a polygon
+    """
+    return _cached_for_polygon(_POLYGON_EDGES, polygon, _build_polygon_edges)
+
+
+def _build_boundary_tree(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Build an STRtree over the boundary edges of a polygon, including the closing edge
+    """
+    poly_xy = _polygon_array(polygon)
+    edges = shapely.linestrings(np.stack((poly_xy, np.roll(poly_xy, -1, axis=0)), axis=1))
+    return shapely.STRtree(edges)
+
+
+def _boundary_tree(polygon: List[Tuple[float, float]]):
+    """
+    Date: 2026-10-15
+    Description: Return the cached STRtree of boundary edges for a polygon
+    """
+    return _cached_for_polygon(_BOUNDARY_TREES, polygon, _build_boundary_tree)
+
+
+@njit(cache=True, fastmath=True)
+def _eval_candidate_numba(xs: np.ndarray, ys: np.ndarray, dxs: np.ndarray, dys: np.ndarray, inv_len2: np.ndarray,
+                          exmin: np.ndarray, exmax: np.ndarray, eymin: np.ndarray, eymax: np.ndarray,
+                          ax: float, ay: float, bx: float, by: float):
+    """
+    Date: 2026-10-15
+    Description: Single pass over the polygon edges for a candidate step from (ax, ay) to (bx, by).
+    Returns (signed_separation, crosses): the distance of (bx, by) to the boundary, positive inside and
+    negative outside, and whether the step crosses the boundary. On a crossing it exits early and the
+    separation is partial
+    """
+    n = xs.shape[0]
+    inside = False
+    min_dist_sq = np.inf
+    step_xmin = min(ax, bx)
+    step_xmax = max(ax, bx)
+    step_ymin = min(ay, by)
+    step_ymax = max(ay, by)
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        x1 = xs[i]
+        y1 = ys[i]
+        x2 = xs[j]
+        y2 = ys[j]
+        
+        # Ray casting parity for the candidate point
+        if (y1 >= by) != (y2 >= by):
+            xinters = (by - y1) * dxs[i] / dys[i] + x1
+            if bx <= xinters:
+                inside = not inside
+        
+        # Squared distance from the candidate to this edge, skipped when its bounding box is already farther
+        box_dx = max(exmin[i] - bx, 0.0, bx - exmax[i])
+        box_dy = max(eymin[i] - by, 0.0, by - eymax[i])
+        if box_dx * box_dx + box_dy * box_dy < min_dist_sq:
+            t = max(0.0, min(1.0, ((bx - x1) * dxs[i] + (by - y1) * dys[i]) * inv_len2[i]))
+            ex = bx - (x1 + t * dxs[i])
+            ey = by - (y1 + t * dys[i])
+            dist_sq = ex * ex + ey * ey
+            if dist_sq < min_dist_sq:
+                min_dist_sq = dist_sq
+        
+        # Same test as segments_intersect, only when the bounding boxes overlap
+        if (step_xmax < exmin[i] or step_xmin > exmax[i] or
+                step_ymax < eymin[i] or step_ymin > eymax[i]):
+            continue
+        if _segments_intersect_numba(ax, ay, bx, by, x1, y1, x2, y2):
+            return math.sqrt(min_dist_sq) if inside else -math.sqrt(min_dist_sq), True
+    return math.sqrt(min_dist_sq) if inside else -math.sqrt(min_dist_sq), False
+
+
+@njit(cache=True)
+def _eval_candidates_numba(xs: np.ndarray, ys: np.ndarray, dxs: np.ndarray, dys: np.ndarray, inv_len2: np.ndarray,
+                           exmin: np.ndarray, exmax: np.ndarray, eymin: np.ndarray, eymax: np.ndarray,
+                           ax: float, ay: float, bxs: np.ndarray, bys: np.ndarray):
+    """
+    Date: 2026-10-15
+    Description: Evaluate a batch of candidate steps from (ax, ay), returning signed separation and crosses arrays
+    """
+    m = bxs.shape[0]
+    signed_separation = np.empty(m, dtype=np.float64)
+    crosses = np.empty(m, dtype=np.bool_)
+    for k in range(m):
+        candidate_separation, candidate_crosses = _eval_candidate_numba(
+            xs, ys, dxs, dys, inv_len2, exmin, exmax, eymin, eymax, ax, ay, bxs[k], bys[k])
+        signed_separation[k] = candidate_separation
+        crosses[k] = candidate_crosses
+    return signed_separation, crosses
+
+
+@njit(cache=True)
+def _first_accepted_candidate_numba(xs: np.ndarray, ys: np.ndarray, dxs: np.ndarray, dys: np.ndarray,
+                                    inv_len2: np.ndarray, exmin: np.ndarray, exmax: np.ndarray,
+                                    eymin: np.ndarray, eymax: np.ndarray, ax: float, ay: float,
+                                    bxs: np.ndarray, bys: np.ndarray,
+                                    min_separation: float, max_separation: float) -> int:
+    """
+    Date: 2026-10-15
+    Description: Index of the first candidate step from (ax, ay) that stays inside without crossing the boundary
+    and lies within [min_separation, max_separation] of it, or -1 if there is none
+    """
+    for k in range(bxs.shape[0]):
+        signed_separation, crosses = _eval_candidate_numba(
+            xs, ys, dxs, dys, inv_len2, exmin, exmax, eymin, eymax, ax, ay, bxs[k], bys[k])
+        if (signed_separation > 0 and not crosses and
+                min_separation <= signed_separation <= max_separation):
+            return k
+    return -1
+
+
+def points_inside_polygon(xs: np.ndarray, ys: np.ndarray, polygon: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Date: 2026-10-15
+    Description: Boolean array of which points (xs[k], ys[k]) are inside the polygon, tested as a batch
+    """
+    xs = np.ascontiguousarray(xs, dtype=np.float64)
+    ys = np.ascontiguousarray(ys, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _pip_many_numba(_polygon_array(polygon), xs, ys)
+    elif SHAPELY_AVAILABLE:
+        return shapely.contains_xy(shapely_polygon(polygon), xs, ys)
+    
+    # Same tests as the scalar fallback in is_point_inside_polygon, broadcast as (points, edges)
+    poly = _polygon_array(polygon)
+    p1x = poly[None, :, 0]
+    p1y = poly[None, :, 1]
+    p2x = np.roll(p1x, -1, axis=1)
+    p2y = np.roll(p1y, -1, axis=1)
+    x = xs[:, None]
+    y = ys[:, None]
+    spans = (y > np.minimum(p1y, p2y)) & (y <= np.maximum(p1y, p2y)) & (x <= np.maximum(p1x, p2x))
+    dy = np.where(p1y != p2y, p2y - p1y, 1.0)  # Horizontal edges never span y
+    xinters = (y - p1y) * (p2x - p1x) / dy + p1x
+    crossings = spans & ((p1x == p2x) | (x <= xinters))
+    return (np.count_nonzero(crossings, axis=1) & 1).astype(bool)
+
 
 def is_point_inside_polygon(point: Tuple[float, float], polygon: List[Tuple[float, float]]) -> bool:
     """
     Date: 2025-08-10
     Description: Check if a point is inside a polygon using ray casting algorithm
     """
-    if not SHAPELY_AVAILABLE:
+    if NUMBA_AVAILABLE:
+        # Compiled ray casting over the cached vertex array
+        return bool(_pip_numba(_polygon_array(polygon), point[0], point[1]))
+    elif not SHAPELY_AVAILABLE:
         # Fallback ray casting implementation
         x, y = point
         n = len(polygon)
@@ -49,9 +317,7 @@ def is_point_inside_polygon(point: Tuple[float, float], polygon: List[Tuple[floa
         return inside
     else:
         # Use Shapely for better performance
-        shapely_polygon = Polygon(polygon)
-        shapely_point = Point(point)
-        return shapely_polygon.contains(shapely_point)
+        return bool(shapely.contains_xy(shapely_polygon(polygon), point[0], point[1]))
 
 
 def calculate_distance_to_polygon(point: Tuple[float, float], polygon: List[Tuple[float, float]]) -> float:
@@ -74,10 +340,8 @@ def calculate_distance_to_polygon(point: Tuple[float, float], polygon: List[Tupl
         
         return min_distance
     else:
-        # Use Shapely for better performance
-        shapely_polygon = Polygon(polygon)
-        shapely_point = Point(point)
-        return shapely_point.distance(shapely_polygon)
+        # Use Shapely for better performance; measure to the boundary ring, not the area
+        return Point(point).distance(shapely_polygon(polygon).exterior)
 
 
 def distance_to_line_segment(point: Tuple[float, float], line_start: Tuple[float, float], line_end: Tuple[float, float]) -> float:
@@ -112,7 +376,8 @@ def would_segment_cross_polygon(start_point: Tuple[float, float], end_point: Tup
                                polygon: List[Tuple[float, float]]) -> bool:
     """
     Date: 2025-08-10
-    Description: Check if line segment would cross polygon boundary
+    Description: Check if line segment would cross polygon boundary; only proper crossings count,
+    as in segments_intersect, so touching an edge or passing through a vertex does not
     """
     if not SHAPELY_AVAILABLE:
         # Fallback intersection check
@@ -126,23 +391,67 @@ def would_segment_cross_polygon(start_point: Tuple[float, float], end_point: Tup
         
         return False
     else:
-        # Use Shapely for better performance
-        shapely_polygon = Polygon(polygon)
+        # Query only the boundary edges whose bounding boxes meet the segment; 'crosses' is the
+        # segments_intersect rule (interiors meet in a point), where 'intersects' would also count touching
         shapely_line = LineString([start_point, end_point])
-        return shapely_line.intersects(shapely_polygon)
+        return len(_boundary_tree(polygon).query(shapely_line, predicate='crosses')) > 0
 
 
 def segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float], 
                       p3: Tuple[float, float], p4: Tuple[float, float]) -> bool:
     """
     Date: 2025-08-10
-    Description: Check if two line segments intersect
+    Description: Check if two line segments intersect, i.e. properly cross (see atpoe.utils.geometric_utils)
     """
-    def ccw(A, B, C):
-        return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
-    
     # Check if line segments intersect
-    return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
+    return bool(_segments_intersect_numba(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1], p4[0], p4[1]))
+
+
+def _candidate_separation(current_point: Tuple[float, float], candidate_point: Tuple[float, float],
+                          polygon: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    Date: 2026-10-15
+    Description: Separation of a candidate from the polygon boundary, or None if the candidate
+    is outside the polygon or the step to it crosses the boundary
+    """
+    if NUMBA_AVAILABLE:
+        # One fused pass over the edges instead of three
+        # Positive signed separation means the candidate is inside
+        signed_separation, crosses = _eval_candidate_numba(
+            *_polygon_edges(polygon), current_point[0], current_point[1], candidate_point[0], candidate_point[1])
+        return signed_separation if signed_separation > 0 and not crosses else None
+    
+    if (is_point_inside_polygon(candidate_point, polygon) and
+        not would_segment_cross_polygon(current_point, candidate_point, polygon)):
+        return calculate_distance_to_polygon(candidate_point, polygon)
+    return None
+
+
+def _find_next_point_candidates(current_point: Tuple[float, float], segment_length: float,
+                                previous_direction: Optional[Tuple[float, float]],
+                                max_turn_angle: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Date: 2026-10-15
+    Description: Candidate points in the order find_next_point tries them: straight on, the small turns
+    within max_turn_angle, then every 30 degrees
+    """
+    direction_xs = [_COS_30]
+    direction_ys = [_SIN_30]
+    if previous_direction:
+        direction_length = math.hypot(previous_direction[0], previous_direction[1])
+        if direction_length > 0:
+            current_cos = previous_direction[0] / direction_length
+            current_sin = previous_direction[1] / direction_length
+        else:
+            current_cos, current_sin = 1.0, 0.0
+        allowed = np.abs(_TURN_ANGLES) <= max_turn_angle
+        turn_cos = _TURN_COS[allowed]
+        turn_sin = _TURN_SIN[allowed]
+        direction_xs[:0] = [np.array([previous_direction[0]]), current_cos * turn_cos - current_sin * turn_sin]
+        direction_ys[:0] = [np.array([previous_direction[1]]), current_sin * turn_cos + current_cos * turn_sin]
+    xs = current_point[0] + np.concatenate(direction_xs) * segment_length
+    ys = current_point[1] + np.concatenate(direction_ys) * segment_length
+    return xs, ys
 
 
 def find_next_point(current_point: Tuple[float, float], previous_polygon: List[Tuple[float, float]], 
@@ -153,67 +462,74 @@ def find_next_point(current_point: Tuple[float, float], previous_polygon: List[T
     Date: 2025-08-10
     Description: Simple algorithm: keep straight on, adjust angle slightly if needed
     """
+    if NUMBA_AVAILABLE:
+        # The whole scan in one compiled call, stopping at the first acceptable candidate
+        xs, ys = _find_next_point_candidates(current_point, segment_length, previous_direction, max_turn_angle)
+        best = _first_accepted_candidate_numba(*_polygon_edges(previous_polygon), current_point[0], current_point[1],
+                                               xs, ys, min_separation, max_separation)
+        if best < 0:
+            return None
+        if _DEBUG:
+            print(f"DEBUG: Found point: {(xs[best], ys[best])}, candidate {best}")
+        return (float(xs[best]), float(ys[best]))
+    
     # First try: keep straight on (angle change = 0)
     if previous_direction:
         # Try to continue in the same direction
-        candidate_x = round(current_point[0] + previous_direction[0] * segment_length, 2)
-        candidate_y = round(current_point[1] + previous_direction[1] * segment_length, 2)
+        candidate_x = current_point[0] + previous_direction[0] * segment_length
+        candidate_y = current_point[1] + previous_direction[1] * segment_length
         candidate_point = (candidate_x, candidate_y)
         
         # Check constraints
-        if (is_point_inside_polygon(candidate_point, previous_polygon) and
-            not would_segment_cross_polygon(current_point, candidate_point, previous_polygon)):
-            
-            separation = calculate_distance_to_polygon(candidate_point, previous_polygon)
-            if min_separation <= separation <= max_separation:
+        separation = _candidate_separation(current_point, candidate_point, previous_polygon)
+        if separation is not None and min_separation <= separation <= max_separation:
+            if _DEBUG:
                 print(f"DEBUG: Found straight point: {candidate_point}, separation={separation:.2f}")
-                return candidate_point
+            return candidate_point
     
     # If straight on fails, try small angle adjustments
     if previous_direction:
-        # Calculate current direction angle
-        current_angle = math.degrees(math.atan2(previous_direction[1], previous_direction[0]))
+        # Current direction as a unit vector (angle 0 for a zero vector, as atan2 gives)
+        direction_length = math.hypot(previous_direction[0], previous_direction[1])
+        if direction_length > 0:
+            current_cos = previous_direction[0] / direction_length
+            current_sin = previous_direction[1] / direction_length
+        else:
+            current_cos, current_sin = 1.0, 0.0
         
         # Try small angle adjustments: ±5°, ±10°, ±15°
-        for angle_adjustment in [0, 5, -5, 10, -10, 15, -15]:
+        for angle_adjustment, adjustment_cos, adjustment_sin in _TURN_ADJUSTMENTS:
             if abs(angle_adjustment) > max_turn_angle:
                 continue
-                
-            new_angle = math.radians(current_angle + angle_adjustment)
-            direction_x = math.cos(new_angle)
-            direction_y = math.sin(new_angle)
             
-            candidate_x = round(current_point[0] + direction_x * segment_length, 2)
-            candidate_y = round(current_point[1] + direction_y * segment_length, 2)
+            # Rotate the current direction by the adjustment
+            direction_x = current_cos * adjustment_cos - current_sin * adjustment_sin
+            direction_y = current_sin * adjustment_cos + current_cos * adjustment_sin
+            
+            candidate_x = current_point[0] + direction_x * segment_length
+            candidate_y = current_point[1] + direction_y * segment_length
             candidate_point = (candidate_x, candidate_y)
             
             # Check constraints
-            if (is_point_inside_polygon(candidate_point, previous_polygon) and
-                not would_segment_cross_polygon(current_point, candidate_point, previous_polygon)):
-                
-                separation = calculate_distance_to_polygon(candidate_point, previous_polygon)
-                if min_separation <= separation <= max_separation:
+            separation = _candidate_separation(current_point, candidate_point, previous_polygon)
+            if separation is not None and min_separation <= separation <= max_separation:
+                if _DEBUG:
                     print(f"DEBUG: Found adjusted point: {candidate_point}, angle={angle_adjustment}°, separation={separation:.2f}")
-                    return candidate_point
+                return candidate_point
     
     # If no point found with small adjustments, try larger angles
-    for angle_offset in range(0, 360, 30):  # Try every 30 degrees
-        angle_rad = math.radians(angle_offset)
-        direction_x = math.cos(angle_rad)
-        direction_y = math.sin(angle_rad)
+    for angle_offset, direction_x, direction_y in _DIRECTIONS_30:  # Try every 30 degrees
         
-        candidate_x = round(current_point[0] + direction_x * segment_length, 2)
-        candidate_y = round(current_point[1] + direction_y * segment_length, 2)
+        candidate_x = current_point[0] + direction_x * segment_length
+        candidate_y = current_point[1] + direction_y * segment_length
         candidate_point = (candidate_x, candidate_y)
         
         # Check constraints
-        if (is_point_inside_polygon(candidate_point, previous_polygon) and
-            not would_segment_cross_polygon(current_point, candidate_point, previous_polygon)):
-            
-            separation = calculate_distance_to_polygon(candidate_point, previous_polygon)
-            if min_separation <= separation <= max_separation:
+        separation = _candidate_separation(current_point, candidate_point, previous_polygon)
+        if separation is not None and min_separation <= separation <= max_separation:
+            if _DEBUG:
                 print(f"DEBUG: Found fallback point: {candidate_point}, angle={angle_offset}°, separation={separation:.2f}")
-                return candidate_point
+            return candidate_point
     
     return None
 
@@ -226,147 +542,121 @@ def find_next_point_with_preferred_direction(current_point: Tuple[float, float],
     Date: 2025-08-10
     Description: Find next point with a preferred direction to force gradual turns
     """
-    best_point = None
-    best_score = float('-inf')
+    # Candidate grid: every 15 degrees, at distances around the target segment length
+    # Smaller variation for more consistent segments; angle-major order matches the original scan
+    distance_factors = np.array([0.9, 1.0, 1.1])
+    reach = segment_length * distance_factors
+    xs = (current_point[0] + _COS_15[:, None] * reach).ravel()
+    ys = (current_point[1] + _SIN_15[:, None] * reach).ravel()
     
-    # Try different directions around the current point
-    for angle_offset in range(0, 360, 15):  # Try every 15 degrees
-        angle_rad = math.radians(angle_offset)
-        
-        # Calculate direction vector
-        direction_x = math.cos(angle_rad)
-        direction_y = math.sin(angle_rad)
-        
-        # Try different distances around the target segment length
-        for distance_factor in [0.9, 1.0, 1.1]:  # Smaller variation for more consistent segments
-            candidate_x = round(current_point[0] + segment_length * distance_factor * direction_x, 2)
-            candidate_y = round(current_point[1] + segment_length * distance_factor * direction_y, 2)
-            candidate_point = (candidate_x, candidate_y)
-            
-            # Check if candidate is valid
-            if not is_point_inside_polygon(candidate_point, previous_polygon):
-                continue
-            
-            # Check minimum segment length - ensure points are not too close
-            segment_distance = math.hypot(candidate_point[0] - current_point[0], 
-                                        candidate_point[1] - current_point[1])
-            if segment_distance < segment_length * 0.8:  # Must be at least 80% of target length
-                continue
-            
-            # Calculate separation from previous polygon
-            separation = calculate_distance_to_polygon(candidate_point, previous_polygon)
-            
-            # Check if segment would cross polygon
-            if would_segment_cross_polygon(current_point, candidate_point, previous_polygon):
-                continue
-            
-            # Score based on separation - prefer points closer to target but allow flexibility
-            if separation < min_separation * 0.5:  # Too close to boundary
-                continue
-            if separation > max_separation * 2.0:  # Too far from boundary
-                continue
-                
-            # Base score: prefer target separation but allow reasonable alternatives
-            separation_penalty = abs(separation - target_separation)
-            score = -separation_penalty
-            
-            # Add direction continuity bonus/penalty
-            if previous_direction:
-                # Calculate current direction vector
-                current_direction_x = candidate_point[0] - current_point[0]
-                current_direction_y = candidate_point[1] - current_point[1]
-                
-                # Normalize both vectors
-                prev_len = math.hypot(previous_direction[0], previous_direction[1])
-                curr_len = math.hypot(current_direction_x, current_direction_y)
-                
-                if prev_len > 0 and curr_len > 0:
-                    # Calculate dot product of normalized vectors
-                    dot_product = (previous_direction[0] * current_direction_x + 
-                                 previous_direction[1] * current_direction_y) / (prev_len * curr_len)
-                    
-                    # Direction continuity bonus: prefer similar directions
-                    direction_bonus = dot_product * 1.0
-                    score += direction_bonus
-            
-            # Add preferred direction bonus to force gradual turns
-            if preferred_direction:
-                # Calculate current direction vector
-                current_direction_x = candidate_point[0] - current_point[0]
-                current_direction_y = candidate_point[1] - current_point[1]
-                
-                # Normalize both vectors
-                pref_len = math.hypot(preferred_direction[0], preferred_direction[1])
-                curr_len = math.hypot(current_direction_x, current_direction_y)
-                
-                if pref_len > 0 and curr_len > 0:
-                    # Calculate dot product with preferred direction
-                    pref_dot_product = (preferred_direction[0] * current_direction_x + 
-                                      preferred_direction[1] * current_direction_y) / (pref_len * curr_len)
-                    
-                    # Bonus for following preferred direction (encourages gradual turns)
-                    preferred_bonus = pref_dot_product * 0.5  # Smaller weight than continuity
-                    score += preferred_bonus
-            
-            if score > best_score:
-                best_score = score
-                best_point = candidate_point
+    # Inside and separation tests for the whole grid in one go
+    crosses = None
+    if NUMBA_AVAILABLE:
+        signed_separations, crosses = _eval_candidates_numba(
+            *_polygon_edges(previous_polygon), current_point[0], current_point[1], xs, ys)
+        inside = signed_separations > 0
+        separations = np.abs(signed_separations)
+    elif SHAPELY_AVAILABLE:
+        prepared = shapely_polygon(previous_polygon)
+        inside = shapely.contains_xy(prepared, xs, ys)
+        separations = shapely.distance(prepared.exterior, shapely.points(xs, ys))
+    else:
+        candidates = list(zip(xs.tolist(), ys.tolist()))
+        inside = [is_point_inside_polygon(candidate, previous_polygon) for candidate in candidates]
+        separations = [calculate_distance_to_polygon(candidate, previous_polygon) for candidate in candidates]
+    
+    inside = np.asarray(inside, dtype=bool)
+    separations = np.asarray(separations, dtype=np.float64)
+    
+    # Direction of each candidate step
+    dx = xs - current_point[0]
+    dy = ys - current_point[1]
+    curr_len_sq = dx * dx + dy * dy
+    curr_len = np.sqrt(curr_len_sq)
+    safe_len = np.where(curr_len > 0, curr_len, 1.0)  # Zero-length steps fail the length check anyway
+    
+    # Valid: inside, at least 80% of the target length, and neither too close to nor too far from the boundary
+    valid = (inside &
+             (curr_len_sq >= (segment_length * 0.8)**2) &
+             (separations >= min_separation * 0.5) &
+             (separations <= max_separation * 2.0))
+    
+    # Check if segment would cross polygon
+    if crosses is not None:
+        valid &= ~crosses
+    else:
+        for k in np.flatnonzero(valid):
+            if would_segment_cross_polygon(current_point, (float(xs[k]), float(ys[k])), previous_polygon):
+                valid[k] = False
+    
+    if not valid.any():
+        return None
+    
+    # Base score: prefer target separation but allow reasonable alternatives
+    scores = -np.abs(separations - target_separation)
+    
+    # Direction continuity bonus: prefer similar directions (dot product of normalized vectors)
+    if previous_direction:
+        prev_len = math.hypot(previous_direction[0], previous_direction[1])
+        if prev_len > 0:
+            scores += (previous_direction[0] * dx + previous_direction[1] * dy) / (prev_len * safe_len)
+    
+    # Preferred direction bonus to force gradual turns, with smaller weight than continuity
+    if preferred_direction:
+        pref_len = math.hypot(preferred_direction[0], preferred_direction[1])
+        if pref_len > 0:
+            scores += 0.5 * (preferred_direction[0] * dx + preferred_direction[1] * dy) / (pref_len * safe_len)
     
-    return best_point
+    # argmax returns the first best candidate, as the original scan did
+    scores[~valid] = -np.inf
+    best = int(np.argmax(scores))
+    return (float(xs[best]), float(ys[best]))
 
 
 def find_next_point_along_boundary(current_point: Tuple[float, float], previous_polygon: List[Tuple[float, float]], 
-                                  segment_length: float, target_separation: float) -> Optional[Tuple[float, float]]:
+                                  segment_length: float, target_separation: float,
+                                  vertex_tree=None) -> Optional[Tuple[float, float]]:
     """
     Date: 2025-08-10
-    Description: Find next point by following the boundary at target_separation distance
+    Description: Find next point by following the boundary at target_separation distance.
+    vertex_tree may be a prebuilt cKDTree over previous_polygon; by default one is built once per polygon
     """
     # Find the closest point on the boundary
-    min_distance = float('inf')
-    closest_boundary_idx = 0
+    if SCIPY_AVAILABLE:
+        if vertex_tree is None:
+            vertex_tree = _vertex_tree(previous_polygon)
+        _, closest_boundary_idx = vertex_tree.query(current_point, k=1)
+        closest_boundary_idx = int(closest_boundary_idx)
+    else:
+        poly_xy = _polygon_array(previous_polygon)
+        closest_boundary_idx = int(np.argmin((poly_xy[:, 0] - current_point[0])**2 +
+                                             (poly_xy[:, 1] - current_point[1])**2))
     
-    for i, boundary_point in enumerate(previous_polygon):
-        distance = math.hypot(current_point[0] - boundary_point[0], 
-                             current_point[1] - boundary_point[1])
-        if distance < min_distance:
-            min_distance = distance
-            closest_boundary_idx = i
+    # Look ahead along the boundary to find next point, up to 20 points at once
+    poly_xy = _polygon_array(previous_polygon)
+    n = len(poly_xy)
+    next_boundary = poly_xy[(closest_boundary_idx + np.arange(1, min(20, n))) % n]
     
-    # Look ahead along the boundary to find next point
-    n = len(previous_polygon)
-    for offset in range(1, min(20, n)):  # Look ahead up to 20 points
-        next_boundary_idx = (closest_boundary_idx + offset) % n
-        next_boundary_point = previous_polygon[next_boundary_idx]
-        
-        # Calculate direction from current to next boundary point
-        dx = next_boundary_point[0] - previous_polygon[closest_boundary_idx][0]
-        dy = next_boundary_point[1] - previous_polygon[closest_boundary_idx][1]
-        
-        # Normalize
-        length = math.hypot(dx, dy)
-        if length == 0:
-            continue
-            
-        dx /= length
-        dy /= length
-        
-        # Calculate perpendicular inward direction
-        inward_x = -dy
-        inward_y = dx
-        
-        # Calculate candidate point at target_separation from boundary
-        candidate_x = round(next_boundary_point[0] + inward_x * target_separation, 2)
-        candidate_y = round(next_boundary_point[1] + inward_y * target_separation, 2)
-        
-        # Check if candidate is valid
-        if is_point_inside_polygon((candidate_x, candidate_y), previous_polygon):
-            # Check if segment length is reasonable
-            segment_distance = math.hypot(candidate_x - current_point[0], 
-                                        candidate_y - current_point[1])
-            if segment_distance <= segment_length * 1.5:  # Allow some flexibility
-                return (candidate_x, candidate_y)
+    # Direction from the closest to each next boundary point, skipping coincident points
+    dx = next_boundary[:, 0] - poly_xy[closest_boundary_idx, 0]
+    dy = next_boundary[:, 1] - poly_xy[closest_boundary_idx, 1]
+    length = np.hypot(dx, dy)
+    nonzero = length > 0
+    safe_length = np.where(nonzero, length, 1.0)
     
-    return None
+    # Candidate points at target_separation along the perpendicular inward direction
+    candidate_xs = next_boundary[:, 0] - dy / safe_length * target_separation
+    candidate_ys = next_boundary[:, 1] + dx / safe_length * target_separation
+    
+    # Valid candidates are inside with a reasonable segment length (allowing some flexibility)
+    segment_distance_sq = (candidate_xs - current_point[0])**2 + (candidate_ys - current_point[1])**2
+    valid = nonzero & (segment_distance_sq <= (segment_length * 1.5)**2)
+    valid[valid] = points_inside_polygon(candidate_xs[valid], candidate_ys[valid], previous_polygon)
+    
+    if not valid.any():
+        return None
+    first = int(np.argmax(valid))
+    return (float(candidate_xs[first]), float(candidate_ys[first]))
 
 
 def should_close_polygon(current_points: List[Tuple[float, float]], start_point: Tuple[float, float], 
@@ -380,11 +670,12 @@ def should_close_polygon(current_points: List[Tuple[float, float]], start_point:
     
     # Check if we can close to start point
     last_point = current_points[-1]
-    distance_to_start = math.hypot(last_point[0] - start_point[0], last_point[1] - start_point[1])
+    dx = last_point[0] - start_point[0]
+    dy = last_point[1] - start_point[1]
     
     # Only close if we're very close to the start point (within 0.2 * segment_length)
     # This ensures the polygon actually reaches back to the start point
-    return distance_to_start <= segment_length * 0.2
+    return dx*dx + dy*dy <= (segment_length * 0.2)**2
 
 
 # OBSOLETE: This complex algorithm has been replaced with a simple one
@@ -427,8 +718,8 @@ def generate_nested_polygon_obsolete(previous_polygon: List[Tuple[float, float]]
         inward_y /= length
         
         # Move inward by target_separation
-        candidate_start = (round(boundary_point[0] + inward_x * target_separation, 2), 
-                          round(boundary_point[1] + inward_y * target_separation, 2))
+        candidate_start = (boundary_point[0] + inward_x * target_separation, 
+                          boundary_point[1] + inward_y * target_separation)
         
         if is_point_inside_polygon(candidate_start, previous_polygon):
             start_point = candidate_start
@@ -443,52 +734,60 @@ def generate_nested_polygon_obsolete(previous_polygon: List[Tuple[float, float]]
     previous_direction = None  # Track the direction from previous to current point
     
     # Calculate dynamic iteration limit based on polygon circumference
-    circumference = sum(math.hypot(previous_polygon[i][0] - previous_polygon[(i+1) % len(previous_polygon)][0],
-                                  previous_polygon[i][1] - previous_polygon[(i+1) % len(previous_polygon)][1])
-                        for i in range(len(previous_polygon)))
+    poly_xy = _polygon_array(previous_polygon)
+    closed = np.vstack((poly_xy, poly_xy[:1]))
+    circumference = float(np.linalg.norm(np.diff(closed, axis=0), axis=1).sum())
     dynamic_max_points = int((circumference / segment_length) * 2)  # Limit to 2x circumference
     actual_max_points = min(max_points, dynamic_max_points)
     
-    print(f"DEBUG: Polygon circumference: {circumference:.1f}, segment_length: {segment_length}")
-    print(f"DEBUG: Dynamic max points: {dynamic_max_points}, using: {actual_max_points}")
+    if _DEBUG:
+        print(f"DEBUG: Polygon circumference: {circumference:.1f}, segment_length: {segment_length}")
+        print(f"DEBUG: Dynamic max points: {dynamic_max_points}, using: {actual_max_points}")
     
     # Adaptive angle system: start with very small turns, increase smoothly when stuck
     current_max_turn_angle = 15.0  # Start with 15° max turn for very smooth curves
     stuck_counter = 0
-    progress_tracker = []
+    # Last 30 points with their rolling bounding box
+    progress_tracker = deque(maxlen=30)
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
     
     for i in range(actual_max_points):
-        print(f"DEBUG: Iteration {i+1}, current_point: {current_point}, max_turn: {current_max_turn_angle:.1f}°")
+        if _DEBUG:
+            print(f"DEBUG: Iteration {i+1}, current_point: {current_point}, max_turn: {current_max_turn_angle:.1f}°")
         
         # Check for infinite loop: if we're stuck in a small area
-        if len(progress_tracker) >= 30:  # Check progress over 30 iterations for smoother detection
-            recent_points = progress_tracker[-30:]
-            min_x, max_x = min(p[0] for p in recent_points), max(p[0] for p in recent_points)
-            min_y, max_y = min(p[1] for p in recent_points), max(p[1] for p in recent_points)
-            
+        if len(progress_tracker) == progress_tracker.maxlen:  # Check progress over 30 iterations for smoother detection
             area_size = (max_x - min_x) * (max_y - min_y)
             if area_size < 800:  # If stuck in area smaller than 800 square units
                 stuck_counter += 1
-                print(f"DEBUG: Detected stuck (iteration {stuck_counter}) - area size: {area_size:.1f}")
+                if _DEBUG:
+                    print(f"DEBUG: Detected stuck (iteration {stuck_counter}) - area size: {area_size:.1f}")
                 
                 # Smooth adaptive angle increase: 15° → 20° → 25° → 30° → 35° → 40°
                 if stuck_counter == 1:
                     current_max_turn_angle = 20.0
-                    print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
+                    if _DEBUG:
+                        print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
                 elif stuck_counter == 2:
                     current_max_turn_angle = 25.0
-                    print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
+                    if _DEBUG:
+                        print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
                 elif stuck_counter == 3:
                     current_max_turn_angle = 30.0
-                    print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
+                    if _DEBUG:
+                        print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
                 elif stuck_counter == 4:
                     current_max_turn_angle = 35.0
-                    print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
+                    if _DEBUG:
+                        print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
                 elif stuck_counter == 5:
                     current_max_turn_angle = 40.0
-                    print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
+                    if _DEBUG:
+                        print(f"DEBUG: Smoothly increasing max turn angle to {current_max_turn_angle}°")
                 elif stuck_counter >= 6:
-                    print(f"DEBUG: Maximum stuck iterations reached, allowing moderate turns")
+                    if _DEBUG:
+                        print(f"DEBUG: Maximum stuck iterations reached, allowing moderate turns")
                     current_max_turn_angle = 60.0  # Allow moderate turns but not extreme ones
             else:
                 # Reset stuck counter if making progress
@@ -501,14 +800,28 @@ def generate_nested_polygon_obsolete(previous_polygon: List[Tuple[float, float]]
                                    previous_direction, current_max_turn_angle)
         
         if not next_point:
-            print(f"DEBUG: No next point found, stopping")
+            if _DEBUG:
+                print(f"DEBUG: No next point found, stopping")
             break
             
-        print(f"DEBUG: Found next_point: {next_point}")
+        if _DEBUG:
+            print(f"DEBUG: Found next_point: {next_point}")
         inner_points.append(next_point)
         
-        # Track progress
+        # Track progress, updating the bounding box incrementally
+        evicted = progress_tracker[0] if len(progress_tracker) == progress_tracker.maxlen else None
         progress_tracker.append(current_point)
+        if evicted is not None and (evicted[0] in (min_x, max_x) or evicted[1] in (min_y, max_y)):
+            # The evicted point was on the box edge, so rescan the window
+            min_x = min(p[0] for p in progress_tracker)
+            max_x = max(p[0] for p in progress_tracker)
+            min_y = min(p[1] for p in progress_tracker)
+            max_y = max(p[1] for p in progress_tracker)
+        else:
+            min_x = min(min_x, current_point[0])
+            max_x = max(max_x, current_point[0])
+            min_y = min(min_y, current_point[1])
+            max_y = max(max_y, current_point[1])
         
         # Calculate direction for next iteration
         previous_direction = (next_point[0] - current_point[0], next_point[1] - current_point[1])
@@ -516,11 +829,20 @@ def generate_nested_polygon_obsolete(previous_polygon: List[Tuple[float, float]]
         
         # Check if we should close the polygon
         if should_close_polygon(inner_points, start_point, segment_length):
-            print(f"DEBUG: Closing polygon after {len(inner_points)} points")
+            if _DEBUG:
+                print(f"DEBUG: Closing polygon after {len(inner_points)} points")
             inner_points.append(start_point)
             break
     
-    return inner_points
+    return _round_points(inner_points)
+
+
+def _round_points(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """
+    Date: 2026-10-15
+    Description: Round point coordinates to 2 decimal places for output
+    """
+    return [(round(x, 2), round(y, 2)) for x, y in points]
 
 
 def generate_nested_polygons(initial_polygon: List[Tuple[float, float]], num_polygons: int, 
@@ -528,11 +850,16 @@ def generate_nested_polygons(initial_polygon: List[Tuple[float, float]], num_pol
                             max_separation: float, inter_curve_distance: float) -> List[List[Tuple[float, float]]]:
     """
     Date: 2025-08-10
-    Description: Generate multiple nested polygons
+    Description: Generate multiple nested polygons.
+    Levels are generated strictly in sequence, as each is built inside the previous one;
+    speed-ups belong within a level (batched candidate evaluation), not across levels
     """
+    # Cached data is per polygon object; start each run afresh so the caches do not grow across runs
+    _clear_polygon_caches()
     polygons = [initial_polygon]
     
     for i in range(num_polygons):
+        # Each level depends on the one before it, so levels cannot run in parallel
         previous_polygon = polygons[-1]
         
         # Adjust separation for this level
@@ -584,7 +911,7 @@ def create_start_point(previous_polygon: List[Tuple[float, float]], target_separ
     start_x = pt_curr[0] + inward_x * target_separation
     start_y = pt_curr[1] + inward_y * target_separation
     
-    return (round(start_x, 2), round(start_y, 2))
+    return (start_x, start_y)
 
 
 def create_smooth_closure(inner_points, start_point, segment_length):
@@ -627,11 +954,12 @@ def generate_inner_curve(start_point: Tuple[float, float], previous_polygon: Lis
         if i > MIN_POINTS:
             dx = current_point[0] - start_point[0]
             dy = current_point[1] - start_point[1]
-            distance_to_start = math.hypot(dx, dy)
-            print(f"dist from {i} ({dx:.2f}, {dy:.2f}) to start {distance_to_start:.2f}")
-            if distance_to_start < max_closure:
-                logger.info(f"i {i} ({dx:.2f}, {dy:.2f}) distance_to_start {distance_to_start}")
-            if distance_to_start <= CLOSURE_THRESHOLD * segment_length:
+            distance_to_start_sq = dx*dx + dy*dy
+            if _DEBUG:
+                print(f"dist from {i} ({dx:.2f}, {dy:.2f}) to start {math.sqrt(distance_to_start_sq):.2f}")
+            if distance_to_start_sq < max_closure**2:
+                logger.info(f"i {i} ({dx:.2f}, {dy:.2f}) distance_to_start {math.sqrt(distance_to_start_sq)}")
+            if distance_to_start_sq <= (CLOSURE_THRESHOLD * segment_length)**2:
                 # Create smooth closure
                 return create_smooth_closure(inner_points, start_point, segment_length)
         
@@ -639,7 +967,8 @@ def generate_inner_curve(start_point: Tuple[float, float], previous_polygon: Lis
         next_point = find_next_point_simple(current_point, previous_polygon, segment_length,
                                          target_separation, min_separation, max_separation)
         if i >= 329:
-            print(f"{i} {next_point}")
+            if _DEBUG:
+                print(f"{i} {next_point}")
             pass # for debugging
         if i >= 334:
             return inner_points
@@ -661,23 +990,16 @@ def find_next_point_simple(current_point: Tuple[float, float], previous_polygon:
     Description: Find next point maintaining segment_length and separation constraints
     """
     # Try different angles to find a valid next point
-    for angle_offset in range(0, 360, 15):  # Try every 15 degrees
-        angle_rad = math.radians(angle_offset)
-        direction_x = math.cos(angle_rad)
-        direction_y = math.sin(angle_rad)
-        
+    for _, direction_x, direction_y in _DIRECTIONS_15:  # Try every 15 degrees
         # Calculate candidate point at segment_length distance
         candidate_x = current_point[0] + direction_x * segment_length
         candidate_y = current_point[1] + direction_y * segment_length
-        candidate_point = (round(candidate_x, 2), round(candidate_y, 2))
+        candidate_point = (candidate_x, candidate_y)
         
         # Check constraints
-        if (is_point_inside_polygon(candidate_point, previous_polygon) and
-            not would_segment_cross_polygon(current_point, candidate_point, previous_polygon)):
-            
-            separation = calculate_distance_to_polygon(candidate_point, previous_polygon)
-            if min_separation <= separation <= max_separation:
-                return candidate_point
+        separation = _candidate_separation(current_point, candidate_point, previous_polygon)
+        if separation is not None and min_separation <= separation <= max_separation:
+            return candidate_point
     
     return None
 
@@ -703,4 +1025,5 @@ def generate_nested_polygon(previous_polygon: List[Tuple[float, float]], segment
     inner_points = generate_inner_curve(start_point, previous_polygon, segment_length, 
                                       target_separation, min_separation, max_separation, max_closure=max_closure)
     
-    return inner_points
+    # Coordinates are quantized once, on output
+    return _round_points(inner_points)
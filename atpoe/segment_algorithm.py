@@ -3,9 +3,191 @@ Segment length algorithm functions - 2024-12-19
 Core function for finding next point at specified distance from current position.
 """
 
+import bisect
+import logging
 import math
 from typing import List, Tuple, Optional
 
+import numpy as np
+
+from atpoe.utils.geometric_utils import _pip_many_numba, _pip_numba, _segments_intersect_numba
+from atpoe.utils.jit import NUMBA_AVAILABLE, njit
+
+logger = logging.getLogger(__name__)
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Per-curve derived data keyed by id(curve); the curve and its length are kept so a reused id
+# or an in-place append is not served stale data
+_CURVE_ARRAYS = {}
+_CURVE_TREES = {}
+_CURVE_MAX_EDGES = {}
+_CURVE_TANGENTS = {}
+_CURVE_COLUMNS = {}
+CURVE_CACHE_SIZE = 64
+
+# Rotations tried by find_safe_alternative_point, as (angle in radians, cos, sin)
+_ALTERNATIVE_ROTATIONS = tuple((angle, math.cos(angle), math.sin(angle))
+                               for angle in (0, 0.1, -0.1, 0.2, -0.2, 0.3, -0.3))
+
+def _cached_for_curve(cache: dict, curve, build):
+    """
+    Return build(curve), computed once per curve object.
+    
+    Date: 2026-10-15
+    Description: Identity cache for data derived from a curve that is not modified in place.
+    """
+    entry = cache.get(id(curve))
+    if entry is not None and entry[0] is curve and entry[1] == len(curve):
+        return entry[2]
+    value = build(curve)
+    if len(cache) >= CURVE_CACHE_SIZE:
+        cache.pop(next(iter(cache)))
+    cache[id(curve)] = (curve, len(curve), value)
+    return value
+
+def _as_array(curve) -> np.ndarray:
+    """
+    Return the curve as an (N, 2) float64 array.
+    
+    Date: 2026-10-15
+    Description: Convert a list of (x, y) tuples once and reuse the array for repeated calls on the same curve.
+    """
+    if isinstance(curve, np.ndarray):
+        return curve.astype(np.float64, copy=False).reshape(-1, 2)
+    return _cached_for_curve(_CURVE_ARRAYS, curve,
+                             lambda points: np.asarray(points, dtype=np.float64).reshape(-1, 2))
+
+def _curve_tree(curve):
+    """
+    Return a KD-tree over the points of the curve.
+    
+    Date: 2026-10-15
+    Description: Built once per curve so nearest-point queries are O(log N) instead of a full scan.
+    """
+    return _cached_for_curve(_CURVE_TREES, curve, lambda points: cKDTree(_as_array(points)))
+
+def _curve_columns(curve) -> np.ndarray:
+    """
+    Return the curve as a (2, N) array with contiguous x and y rows.
+    
+    Date: 2026-10-15
+    Description: Structure-of-arrays layout for the compiled distance scan. Kept in float64: float32
+    gave no measurable speedup and changes which of two equally distant candidates wins.
+    """
+    return _cached_for_curve(_CURVE_COLUMNS, curve, lambda points: np.ascontiguousarray(_as_array(points).T))
+
+def _curve_tangents(curve) -> np.ndarray:
+    """
+    Return the unit tangent at every point of a closed curve as an (N, 2) array.
+    
+    Date: 2026-10-15
+    Description: calculate_tangent_at_point for all indices at once, with the same 3-point average.
+    """
+    def build(points):
+        points = _as_array(points)
+        if len(points) < 3:
+            return np.tile([1.0, 0.0], (len(points), 1))
+        to_point = points - np.roll(points, 1, axis=0)
+        from_point = np.roll(points, -1, axis=0) - points
+        tangents = (to_point + from_point) / 2.0
+        lengths = np.sqrt(tangents[:, 0] * tangents[:, 0] + tangents[:, 1] * tangents[:, 1])
+        degenerate = lengths == 0
+        tangents /= np.where(degenerate, 1.0, lengths)[:, None]
+        tangents[degenerate] = (1.0, 0.0)
+        return tangents
+    return _cached_for_curve(_CURVE_TANGENTS, curve, build)
+
+def _max_edge_length(curve) -> float:
+    """
+    Return the length of the longest edge of the open curve.
+    
+    Date: 2026-10-15
+    Description: Bounds how far an edge that crosses a step can lie from the step's end point.
+    """
+    def build(points):
+        deltas = np.diff(_as_array(points), axis=0)
+        return float(np.hypot(deltas[:, 0], deltas[:, 1]).max()) if len(deltas) else 0.0
+    return _cached_for_curve(_CURVE_MAX_EDGES, curve, build)
+
+def _nearby_outer_edges(outer_curve, candidate_point: Tuple[float, float],
+                        last_point: Tuple[float, float]) -> np.ndarray:
+    """
+    Return start indices of the outer edges that could cross the step from last_point to candidate_point.
+    
+    Date: 2026-10-15
+    Description: Any crossing edge has an end point within step length plus the longest edge of the candidate.
+    """
+    step = math.hypot(candidate_point[0] - last_point[0], candidate_point[1] - last_point[1])
+    radius = step + _max_edge_length(outer_curve)
+    near = np.asarray(_curve_tree(outer_curve).query_ball_point(candidate_point, radius), dtype=np.int64)
+    starts = np.unique(np.concatenate([near - 1, near]))
+    return starts[(starts >= 0) & (starts < len(outer_curve) - 1)]
+
+@njit(cache=True, fastmath=True)
+def _min_distances_numba(xs: np.ndarray, ys: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """
+    Distance from each point (xs[k], ys[k]) to the nearest point of a curve.
+    
+    Date: 2026-10-15
+    Description: columns is the (2, N) x/y layout; the inner min-reduction over contiguous rows vectorizes.
+    """
+    outer_xs = columns[0]
+    outer_ys = columns[1]
+    result = np.empty(xs.shape[0], dtype=np.float64)
+    for k in range(xs.shape[0]):
+        x = xs[k]
+        y = ys[k]
+        min_dist_sq = np.inf
+        for i in range(outer_xs.shape[0]):
+            dx = outer_xs[i] - x
+            dy = outer_ys[i] - y
+            min_dist_sq = min(min_dist_sq, dx * dx + dy * dy)
+        result[k] = math.sqrt(min_dist_sq)
+    return result
+
+@njit(cache=True)
+def _validate_point_safety_numba(cx: float, cy: float, outer: np.ndarray, outer_points: np.ndarray,
+                                 outer_edges: np.ndarray, existing: np.ndarray,
+                                 outer_limit_sq: float, existing_limit_sq: float) -> bool:
+    """
+    Separation and crossing checks of validate_point_safety in one compiled pass.
+    
+    Date: 2026-10-15
+    Description: outer and existing are (N, 2) and (M, 2) float64 arrays; only the outer points and
+    edges (by start index) listed in outer_points and outer_edges are checked. Points closer than the
+    square roots of the squared limits violate the separation.
+    """
+    for i in outer_points:
+        dx = cx - outer[i, 0]
+        dy = cy - outer[i, 1]
+        if dx * dx + dy * dy < outer_limit_sq:
+            return False
+    
+    m = existing.shape[0]
+    for i in range(m):
+        dx = cx - existing[i, 0]
+        dy = cy - existing[i, 1]
+        if dx * dx + dy * dy < existing_limit_sq:
+            return False
+    
+    if m >= 2:
+        lx = existing[m - 1, 0]
+        ly = existing[m - 1, 1]
+        for i in range(m - 1):
+            if _segments_intersect_numba(lx, ly, cx, cy, existing[i, 0], existing[i, 1],
+                                         existing[i + 1, 0], existing[i + 1, 1]):
+                return False
+        for i in outer_edges:
+            if _segments_intersect_numba(lx, ly, cx, cy, outer[i, 0], outer[i, 1],
+                                         outer[i + 1, 0], outer[i + 1, 1]):
+                return False
+    return True
+
 def calculate_tangent_at_point(curve: List[Tuple[float, float]], point_index: int) -> Tuple[float, float]:
     """
     Calculate tangent direction at a specific point on the curve.
@@ -22,11 +204,15 @@ def calculate_tangent_at_point(curve: List[Tuple[float, float]], point_index: in
     next_idx = (point_index + 1) % n
     
     # Calculate direction vectors
-    dx1 = curve[point_index][0] - curve[prev_idx][0]
-    dy1 = curve[point_index][1] - curve[prev_idx][1]
+    prev_x, prev_y = curve[prev_idx]
+    x, y = curve[point_index]
+    next_x, next_y = curve[next_idx]
+    
+    dx1 = x - prev_x
+    dy1 = y - prev_y
     
-    dx2 = curve[next_idx][0] - curve[point_index][0]
-    dy2 = curve[next_idx][1] - curve[point_index][1]
+    dx2 = next_x - x
+    dy2 = next_y - y
     
     # Average the directions
     dx = (dx1 + dx2) / 2.0
@@ -42,12 +228,14 @@ def calculate_tangent_at_point(curve: List[Tuple[float, float]], point_index: in
     
     return (dx, dy)
 
-def calculate_inward_normal(tangent: Tuple[float, float], curve: List[Tuple[float, float]], point: Tuple[float, float]) -> Tuple[float, float]:
+def calculate_inward_normal(tangent: Tuple[float, float], curve: List[Tuple[float, float]], point: Tuple[float, float],
+                            center: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
     """
     Calculate inward normal (perpendicular to tangent, pointing inside).
     
     Date: 2024-12-19
     Description: Calculate perpendicular direction that points toward curve interior.
+    Callers making many calls on one curve can pass its precomputed center.
     """
     tx, ty = tangent
     
@@ -56,8 +244,9 @@ def calculate_inward_normal(tangent: Tuple[float, float], curve: List[Tuple[floa
     normal2 = (-ty, tx)
     
     # Choose the one that points more toward curve center
-    center_x = sum(p[0] for p in curve) / len(curve)
-    center_y = sum(p[1] for p in curve) / len(curve)
+    if center is None:
+        center = _as_array(curve).mean(axis=0).tolist()
+    center_x, center_y = center
     
     to_center_x = center_x - point[0]
     to_center_y = center_y - point[1]
@@ -83,25 +272,34 @@ def generate_curve_following_segments(
     if not outer_curve or len(outer_curve) < 3:
         return []
     
+    # Cumulative arc length at each outer point, so advancing along the curve is a binary search
+    deltas = np.diff(_as_array(outer_curve), axis=0)
+    arc_lengths = np.concatenate([[0.0], np.cumsum(np.hypot(deltas[:, 0], deltas[:, 1]))]).tolist()
+    last_index = len(outer_curve) - 1
+    
     if num_segments is None:
         # Estimate number of segments based on curve perimeter
-        perimeter = sum(math.hypot(outer_curve[i+1][0] - outer_curve[i][0], 
-                                 outer_curve[i+1][1] - outer_curve[i][1]) 
-                       for i in range(len(outer_curve)-1))
+        perimeter = arc_lengths[-1]
         num_segments = max(3, int(perimeter / segment_length))
     
     new_segments = []
+    skipped_segments = 0
     
     # Start at first point of outer curve
     current_outer_index = 0
     current_outer_point = outer_curve[0]
+    current_arc_length = 0.0
+    
+    # The centroid and the tangents do not change while following the curve
+    outer_center = _as_array(outer_curve).mean(axis=0).tolist()
+    outer_tangents = _curve_tangents(outer_curve).tolist()
     
     for segment_idx in range(num_segments):
         # Calculate tangent at current position on outer curve
-        tangent = calculate_tangent_at_point(outer_curve, current_outer_index)
+        tangent = tuple(outer_tangents[current_outer_index])
         
         # Calculate inward normal
-        inward_normal = calculate_inward_normal(tangent, outer_curve, current_outer_point)
+        inward_normal = calculate_inward_normal(tangent, outer_curve, current_outer_point, outer_center)
         
         # Use inward normal direction but with very small distance to avoid crossings
         # Reduce distance to prevent curve following from getting too close to itself
@@ -124,33 +322,31 @@ def generate_curve_following_segments(
 # Alternative point accepted
             else:
                 # Skip this point to avoid violations, but still advance along curve
-                print(f"Warning: Skipping point to avoid crossing violation at segment {segment_idx}")
+                skipped_segments += 1
+                logger.debug("Skipping point to avoid crossing violation at segment %d", segment_idx)
                 # Don't add point, but continue to advance along original curve
         
-        # Move forward along the outer curve by segment_length
-        remaining_distance = segment_length
+        # Move forward along the outer curve by segment_length, stopping at its last point
+        if segment_length <= 0 or current_outer_index >= last_index:
+            continue
+        current_arc_length = min(current_arc_length + segment_length, arc_lengths[-1])
+        current_outer_index = min(bisect.bisect_right(arc_lengths, current_arc_length) - 1, last_index)
         
-        while remaining_distance > 0 and current_outer_index < len(outer_curve) - 1:
-            next_idx = current_outer_index + 1
-            segment_dist = math.hypot(
-                outer_curve[next_idx][0] - current_outer_point[0],
-                outer_curve[next_idx][1] - current_outer_point[1]
+        overshoot = current_arc_length - arc_lengths[current_outer_index]
+        if current_outer_index == last_index or overshoot <= 0:
+            current_outer_point = outer_curve[current_outer_index]
+        else:
+            # Interpolate within current segment
+            ratio = overshoot / (arc_lengths[current_outer_index + 1] - arc_lengths[current_outer_index])
+            start = outer_curve[current_outer_index]
+            end = outer_curve[current_outer_index + 1]
+            current_outer_point = (
+                start[0] + ratio * (end[0] - start[0]),
+                start[1] + ratio * (end[1] - start[1])
             )
-            
-            if segment_dist <= remaining_distance:
-                # Move to next point
-                remaining_distance -= segment_dist
-                current_outer_index = next_idx
-                current_outer_point = outer_curve[current_outer_index]
-            else:
-                # Interpolate within current segment
-                ratio = remaining_distance / segment_dist
-                current_outer_point = (
-                    current_outer_point[0] + ratio * (outer_curve[next_idx][0] - current_outer_point[0]),
-                    current_outer_point[1] + ratio * (outer_curve[next_idx][1] - current_outer_point[1])
-                )
-                remaining_distance = 0
     
+    if skipped_segments:
+        logger.warning("Skipped %d of %d points to avoid crossing violations", skipped_segments, num_segments)
     return new_segments
 
 def find_next_point_at_distance(
@@ -176,49 +372,50 @@ def find_next_point_at_distance(
     Returns:
         Next point (x, y) or None if no valid point found
     """
-    if not outer_curve or len(outer_curve) < 3:
-        return None
-    
-    # Calculate center of outer curve for reference
-    center_x = sum(p[0] for p in outer_curve) / len(outer_curve)
-    center_y = sum(p[1] for p in outer_curve) / len(outer_curve)
-    
-    # Try multiple directions around the current point
-    num_attempts = 16  # Try 16 different directions
-    best_point = None
-    best_score = float('inf')
-    
-    for i in range(num_attempts):
-        # Calculate direction to try
-        test_direction = direction + (2 * math.pi * i / num_attempts)
-        
-        # Calculate candidate point at segment_length distance
-        candidate_x = current_point[0] + segment_length * math.cos(test_direction)
-        candidate_y = current_point[1] + segment_length * math.sin(test_direction)
-        candidate_point = (candidate_x, candidate_y)
-        
-        # Find closest point on outer curve
-        min_dist_to_outer = float('inf')
-        for outer_point in outer_curve:
-            dist = math.hypot(candidate_x - outer_point[0], candidate_y - outer_point[1])
-            min_dist_to_outer = min(min_dist_to_outer, dist)
-        
-        # Calculate score based on how close we are to target distance
-        distance_error = abs(min_dist_to_outer - distance)
-        
-        # Prefer points that are inside the outer curve
-        is_inside = is_point_inside_curve(candidate_point, outer_curve)
-        
-        # Score: lower is better
-        score = distance_error
-        if not is_inside:
-            score += 1000  # Heavy penalty for being outside
-        
-        if score < best_score:
-            best_score = score
-            best_point = candidate_point
+    return find_next_points_at_distance(current_point, outer_curve, segment_length, distance, [direction])[0]
+
+def find_next_points_at_distance(
+    current_point: Tuple[float, float], 
+    outer_curve: List[Tuple[float, float]], 
+    segment_length: float, 
+    distance: float,
+    directions
+) -> List[Optional[Tuple[float, float]]]:
+    """
+    Find the next point for several initial directions at once.
     
-    return best_point
+    Date: 2026-10-15
+    Description: Batch form of find_next_point_at_distance; the candidates for all directions share one distance query and one inside test.
+    """
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 1)
+    if outer_curve is None or len(outer_curve) < 3:
+        return [None] * len(directions)
+    
+    # All 16 candidate directions around the current point at segment_length distance, one row per direction
+    num_attempts = 16
+    test_directions = (directions + 2 * np.pi * np.arange(num_attempts) / num_attempts).ravel()
+    xs = current_point[0] + segment_length * np.cos(test_directions)
+    ys = current_point[1] + segment_length * np.sin(test_directions)
+    
+    # Closest point on outer curve for every candidate, as one batch query; for small batches the
+    # compiled scan beats the KD-tree even on 20000-point curves
+    if NUMBA_AVAILABLE:
+        min_dists_to_outer = _min_distances_numba(xs, ys, _curve_columns(outer_curve))
+    elif SCIPY_AVAILABLE:
+        min_dists_to_outer, _ = _curve_tree(outer_curve).query(np.column_stack([xs, ys]), k=1)
+    else:
+        outer = _as_array(outer_curve)
+        dx = xs[:, None] - outer[None, :, 0]
+        dy = ys[:, None] - outer[None, :, 1]
+        min_dists_to_outer = np.sqrt((dx * dx + dy * dy).min(axis=1))
+    
+    # Score: distance error, lower is better, with a heavy penalty for being outside
+    scores = np.abs(min_dists_to_outer - distance)
+    scores[~_points_inside_curve(outer_curve, xs, ys)] += 1000
+    
+    # argmin keeps the first of equal scores, as the sequential scan did
+    best = np.argmin(scores.reshape(len(directions), num_attempts), axis=1) + num_attempts * np.arange(len(directions))
+    return list(zip(xs[best].tolist(), ys[best].tolist()))
 
 def is_point_inside_curve(point: Tuple[float, float], curve: List[Tuple[float, float]]) -> bool:
     """
@@ -231,17 +428,40 @@ def is_point_inside_curve(point: Tuple[float, float], curve: List[Tuple[float, f
         return False
     
     x, y = point
-    inside = False
-    
-    for i in range(len(curve)):
-        j = (i + 1) % len(curve)
-        xi, yi = curve[i]
-        xj, yj = curve[j]
-        
-        if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi) + xi):
-            inside = not inside
+    if NUMBA_AVAILABLE:
+        return bool(_pip_numba(_as_array(curve), float(x), float(y)))
+    return bool(_points_inside_curve(curve, [x], [y])[0])
+
+def _points_inside_curve(curve: List[Tuple[float, float]], xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Check which points (xs[k], ys[k]) are inside a closed curve.
     
-    return inside
+    Date: 2026-10-15
+    Description: Batched is_point_inside_curve, broadcasting the points against every edge.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if len(curve) < 3:
+        return np.zeros(xs.shape[0], dtype=bool)
+    
+    points = _as_array(curve)
+    if NUMBA_AVAILABLE:
+        return _pip_many_numba(points, xs, ys)
+    
+    # Branch-free crossing count: one row of edge tests per point, reduced to its parity
+    xi = points[None, :, 0]
+    yi = points[None, :, 1]
+    xj = np.roll(xi, -1, axis=1)
+    yj = np.roll(yi, -1, axis=1)
+    x = xs[:, None]
+    y = ys[:, None]
+    
+    # Edges that straddle the horizontal ray (lower end exclusive, as _pip_numba); the others get a dummy
+    # denominator so nothing divides by zero
+    straddles = (yi >= y) != (yj >= y)
+    dy = np.where(straddles, yj - yi, 1.0)
+    crossings = straddles & (x <= (xj - xi) * (y - yi) / dy + xi)
+    return (np.count_nonzero(crossings, axis=1) & 1).astype(bool)
 
 def validate_point_safety(candidate_point: Tuple[float, float], 
                          outer_curve: List[Tuple[float, float]], 
@@ -253,37 +473,80 @@ def validate_point_safety(candidate_point: Tuple[float, float],
     Date: 2024-12-19
     Description: Enforce RULE 4 - No crossings and minimum separation.
     """
+    outer = _as_array(outer_curve)
+    
     # Check minimum separation from nearby points on outer curve only
     # Only check points within a reasonable radius to avoid false positives from distant curve parts
     max_check_distance = min_separation * 3  # Check within 3x the minimum separation
-    for i, outer_point in enumerate(outer_curve):
-        distance = math.hypot(candidate_point[0] - outer_point[0], candidate_point[1] - outer_point[1])
-        if distance < max_check_distance and distance < min_separation:
-# Minimum separation violation detected
+    outer_limit = min(max_check_distance, min_separation)
+    
+    # Thresholds are compared squared; a non-positive limit can never be violated
+    outer_limit_sq = outer_limit * outer_limit if outer_limit > 0 else -1.0
+    existing_limit_sq = min_separation * min_separation if min_separation > 0 else -1.0
+    
+    if SCIPY_AVAILABLE and len(outer):
+        # The nearest outer point decides the separation check; only edges near the step can be crossed
+        nearest, _ = _curve_tree(outer_curve).query(candidate_point)
+        if nearest < outer_limit:
             return False
+        outer_points = np.empty(0, dtype=np.int64)
+        if len(existing_segments) >= 2:
+            outer_edges = _nearby_outer_edges(outer_curve, candidate_point, existing_segments[-1])
+        else:
+            outer_edges = outer_points
+    else:
+        outer_points = np.arange(len(outer))
+        outer_edges = np.arange(max(len(outer) - 1, 0))
+    
+    if NUMBA_AVAILABLE:
+        existing = np.asarray(existing_segments, dtype=np.float64).reshape(-1, 2)
+        return bool(_validate_point_safety_numba(float(candidate_point[0]), float(candidate_point[1]), outer,
+                                                 outer_points, outer_edges, existing,
+                                                 float(outer_limit_sq), float(existing_limit_sq)))
+    
+    dx = outer[outer_points, 0] - candidate_point[0]
+    dy = outer[outer_points, 1] - candidate_point[1]
+    if np.any(dx * dx + dy * dy < outer_limit_sq):
+# Minimum separation violation detected
+        return False
     
     # Check minimum separation from existing generated segments
-    for i, existing_point in enumerate(existing_segments):
-        distance = math.hypot(candidate_point[0] - existing_point[0], candidate_point[1] - existing_point[1])
-        if distance < min_separation:
+    if len(existing_segments):
+        existing = np.asarray(existing_segments, dtype=np.float64).reshape(-1, 2)
+        dx = existing[:, 0] - candidate_point[0]
+        dy = existing[:, 1] - candidate_point[1]
+        if np.any(dx * dx + dy * dy < existing_limit_sq):
 # Too close to existing segment
             return False
     
     # Check for line segment crossings if we have enough points
     if len(existing_segments) >= 2:
         # Check if line from last segment to candidate crosses any existing segments
-        last_point = existing_segments[-1]
-        for i in range(len(existing_segments) - 1):
-            if segments_intersect(last_point, candidate_point, existing_segments[i], existing_segments[i + 1]):
-                return False
+        last_point = existing[-1]
+        if np.any(_crosses_segments(last_point, candidate_point, existing[:-1], existing[1:])):
+            return False
         
         # Check if line crosses outer curve segments
-        for i in range(len(outer_curve) - 1):
-            if segments_intersect(last_point, candidate_point, outer_curve[i], outer_curve[i + 1]):
-                return False
+        if np.any(_crosses_segments(last_point, candidate_point, outer[outer_edges], outer[outer_edges + 1])):
+            return False
     
     return True
 
+def _crosses_segments(p1, p2, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Check segment p1-p2 against many segments at once.
+    
+    Date: 2026-10-15
+    Description: segments_intersect broadcast over (E, 2) arrays of segment start and end points.
+    """
+    def ccw_sign(a, b, c):
+        return (c[..., 1] - a[..., 1]) * (b[..., 0] - a[..., 0]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+    
+    p1 = np.asarray(p1, dtype=np.float64)
+    p2 = np.asarray(p2, dtype=np.float64)
+    return ((ccw_sign(p1, starts, ends) * ccw_sign(p2, starts, ends) < 0) &
+            (ccw_sign(p1, p2, starts) * ccw_sign(p1, p2, ends) < 0))
+
 def segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float], 
                       p3: Tuple[float, float], p4: Tuple[float, float]) -> bool:
     """
@@ -292,11 +555,9 @@ def segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float],
     Date: 2024-12-19
     Description: Line segment intersection detection for crossing prevention.
     """
-    def ccw(A, B, C):
-        return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
-    
-    # Check if segments p1p2 and p3p4 intersect
-    return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
+    # Check if segments p1p2 and p3p4 properly cross
+    return bool(_segments_intersect_numba(float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1]),
+                                          float(p3[0]), float(p3[1]), float(p4[0]), float(p4[1])))
 
 def find_safe_alternative_point(candidate_point: Tuple[float, float], 
                                outer_curve: List[Tuple[float, float]], 
@@ -312,19 +573,19 @@ def find_safe_alternative_point(candidate_point: Tuple[float, float],
     if not existing_segments:
         return candidate_point
     
-    last_point = existing_segments[-1]
+    last_x, last_y = existing_segments[-1]
     min_separation = distance * 0.5
     
+    # Converted once for all the validate_point_safety calls below
+    existing = np.asarray(existing_segments, dtype=np.float64).reshape(-1, 2)
+    
+    # Direction to the desired position, adjusted slightly by each offset
+    dx = candidate_point[0] - last_x
+    dy = candidate_point[1] - last_y
+    
     # Try different angles around the desired position
-    for angle_offset in [0, 0.1, -0.1, 0.2, -0.2, 0.3, -0.3]:
-        # Adjust direction slightly
-        dx = candidate_point[0] - last_point[0]
-        dy = candidate_point[1] - last_point[1]
-        
+    for angle_offset, cos_offset, sin_offset in _ALTERNATIVE_ROTATIONS:
         # Rotate by angle_offset
-        cos_offset = math.cos(angle_offset)
-        sin_offset = math.sin(angle_offset)
-        
         new_dx = dx * cos_offset - dy * sin_offset
         new_dy = dx * sin_offset + dy * cos_offset
         
@@ -334,9 +595,9 @@ def find_safe_alternative_point(candidate_point: Tuple[float, float],
             new_dx = new_dx * segment_length / length
             new_dy = new_dy * segment_length / length
         
-        alternative_point = (last_point[0] + new_dx, last_point[1] + new_dy)
+        alternative_point = (last_x + new_dx, last_y + new_dy)
         
-        if validate_point_safety(alternative_point, outer_curve, existing_segments, min_separation):
+        if validate_point_safety(alternative_point, outer_curve, existing, min_separation):
             return alternative_point
     
     return None
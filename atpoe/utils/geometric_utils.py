@@ -5,6 +5,8 @@ Description: Geometric utility functions for polygon generation and testing
 
 import numpy as np
 
+from atpoe.utils.jit import njit
+
 def bounding_polygon(centre=(500, 500), radius=500, npoints=1000):
     """
     Date: 2024-08-20
@@ -19,10 +21,73 @@ def bounding_polygon(centre=(500, 500), radius=500, npoints=1000):
     pts: list of tuples, the points on the circle
     """
     theta = np.linspace(0, 2*np.pi, npoints)
-    pts = []
-    for i in range(npoints):
-        x = centre[0] + radius*np.cos(theta[i])
-        y = centre[1] + radius*np.sin(theta[i])
-        pts.append((x, y))
-    return pts
+    xs = centre[0] + radius*np.cos(theta)
+    ys = centre[1] + radius*np.sin(theta)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+# Boundary rules shared by the compiled kernels below and the fallbacks that mirror them:
+# - point in polygon: an edge counts when the horizontal ray from the point meets it, with the edge's
+#   lower end excluded (min(y1, y2) < py <= max(y1, y2)) and the crossing at or right of the point
+#   (px <= x at py), so a vertex on the ray is counted once
+# - segment intersection: segments intersect only when they properly cross, each having its end points
+#   strictly on opposite sides of the other; touching at an end point, passing through a vertex and
+#   collinear overlap do not count, so consecutive segments of a path never intersect at their shared point
+
+
+@njit(cache=True, fastmath=True)
+def _pip_numba(poly_xy: np.ndarray, px: float, py: float) -> bool:
+    """
+    Date: 2026-10-15
+    Description: Ray casting point-in-polygon test over an (n, 2) vertex array
+    """
+    n = poly_xy.shape[0]
+    inside = False
+    j = n - 1
+    for i in range(n):
+        xi = poly_xy[i, 0]
+        yi = poly_xy[i, 1]
+        xj = poly_xy[j, 0]
+        yj = poly_xy[j, 1]
+        # Edge spans the ray's y (lower end exclusive) and the crossing lies at or right of the point
+        if (yi >= py) != (yj >= py):
+            xinters = (py - yi) * (xj - xi) / (yj - yi) + xi
+            if px <= xinters:
+                inside = not inside
+        j = i
+    return inside
+
+
+@njit(cache=True)
+def _pip_many_numba(poly_xy: np.ndarray, pxs: np.ndarray, pys: np.ndarray) -> np.ndarray:
+    """
+    Date: 2026-10-15
+    Description: Ray casting point-in-polygon test for arrays of points
+    """
+    inside = np.empty(pxs.shape[0], dtype=np.bool_)
+    for k in range(pxs.shape[0]):
+        inside[k] = _pip_numba(poly_xy, pxs[k], pys[k])
+    return inside
+
 
+@njit(cache=True, inline='always')
+def _ccw_sign(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """
+    Date: 2026-10-15
+    Description: Cross product (B - A) x (C - A); positive when A, B, C turn counter-clockwise
+    """
+    return (cy - ay) * (bx - ax) - (by - ay) * (cx - ax)
+
+
+@njit(cache=True)
+def _segments_intersect_numba(x1: float, y1: float, x2: float, y2: float,
+                              x3: float, y3: float, x4: float, y4: float) -> bool:
+    """
+    Date: 2026-10-15
+    Description: Segments (1-2) and (3-4) intersect when each has its endpoints strictly on opposite sides of the other
+    """
+    side_1 = _ccw_sign(x1, y1, x3, y3, x4, y4)
+    side_2 = _ccw_sign(x2, y2, x3, y3, x4, y4)
+    side_3 = _ccw_sign(x1, y1, x2, y2, x3, y3)
+    side_4 = _ccw_sign(x1, y1, x2, y2, x4, y4)
+    return (side_1 * side_2 < 0.0) & (side_3 * side_4 < 0.0)
@@ -0,0 +1,21 @@
+"""
+Date: 2026-10-15
+Description: Optional Numba JIT compilation with a pure-Python fallback.
+Kernels use njit(cache=True), so compiled code is written to __pycache__ and only
+the first run after installation pays the compilation cost
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Date: 2026-10-15
+        Description: Stand-in for numba.njit that returns the function uncompiled
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
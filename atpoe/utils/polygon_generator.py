@@ -52,11 +52,8 @@ def generate_inner_polygon_with_validation(
     if lenpoly > max_points:
         raise ValueError(f"Polygon generation exceeded point limit: {lenpoly} > {max_points}")
     
-    # Get unique points
-    unique_points = []
-    for point in inner_polygon:
-        if point not in unique_points:
-            unique_points.append(point)
+    # Get unique points, keeping first-seen order
+    unique_points = list(dict.fromkeys(inner_polygon))
     
     assert len(unique_points) > 3, f"not enough unique points {len(unique_points)}"
     
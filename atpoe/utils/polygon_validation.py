@@ -11,12 +11,16 @@ def validate_inner_polygon_containment(outer_polygon, inner_polygon):
     Returns:
     bool: True if all points are inside, False otherwise
     """
-    from atpoe.fog_polygon_generator import is_point_inside_polygon
+    import numpy as np
+    from atpoe.fog_polygon_generator import SHAPELY_AVAILABLE, points_inside_polygon, shapely_polygon
     
-    for point in inner_polygon:
-        if not is_point_inside_polygon(point, outer_polygon):
-            return False
-    return True
+    # Test every inner point in one batch rather than one call per point
+    points = np.asarray(inner_polygon, dtype=np.float64).reshape(-1, 2)
+    if SHAPELY_AVAILABLE:
+        # GEOS prepared-polygon test scales as log(outer size) per point, well ahead of ray casting for big polygons
+        import shapely
+        return bool(shapely.contains_xy(shapely_polygon(outer_polygon), points[:, 0], points[:, 1]).all())
+    return bool(points_inside_polygon(points[:, 0], points[:, 1], outer_polygon).all())
 
 def validate_point_separations(unique_points, outer_polygon, target_separation, tolerance_percent=0.1):
     """
@@ -26,7 +30,8 @@ def validate_point_separations(unique_points, outer_polygon, target_separation,
     Returns:
     tuple: (is_valid, first_separation, second_separation, tolerance)
     """
-    from atpoe.fog_polygon_generator import calculate_distance_to_polygon
+    import numpy as np
+    from atpoe.fog_polygon_generator import SHAPELY_AVAILABLE, calculate_distance_to_polygon, shapely_polygon
     
     if len(unique_points) < 2:
         return False, 0, 0, 0
@@ -34,8 +39,15 @@ def validate_point_separations(unique_points, outer_polygon, target_separation,
     first_point = unique_points[0]
     second_point = unique_points[1]
     
-    first_separation = calculate_distance_to_polygon(first_point, outer_polygon)
-    second_separation = calculate_distance_to_polygon(second_point, outer_polygon)
+    if SHAPELY_AVAILABLE:
+        # Both separations in one query against the cached boundary ring
+        import shapely
+        points = np.asarray([first_point, second_point], dtype=np.float64)
+        separations = shapely.distance(shapely_polygon(outer_polygon).exterior, shapely.points(points))
+        first_separation, second_separation = separations.tolist()
+    else:
+        first_separation = calculate_distance_to_polygon(first_point, outer_polygon)
+        second_separation = calculate_distance_to_polygon(second_point, outer_polygon)
     
     separation_tolerance = target_separation * tolerance_percent
     is_valid = abs(first_separation - second_separation) <= separation_tolerance
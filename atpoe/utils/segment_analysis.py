@@ -5,6 +5,9 @@ Helper functions for analyzing curve segments and lengths.
 
 import math
 from typing import List, Tuple, Dict, Any
+
+import numpy as np
+
 from atpoe.config_loader import load_config
 
 def analyze_curve_segments(curve: List[Tuple[float, float]], target_length: float) -> Dict[str, Any]:
@@ -38,9 +41,9 @@ def analyze_curve_segments(curve: List[Tuple[float, float]], target_length: floa
             'segment_lengths': []
         }
     
-    segment_lengths = get_segment_lengths(curve)
+    lengths = np.round(_segment_lengths_array(curve), 2)
     
-    if not segment_lengths:
+    if not len(lengths):
         return {
             'num_segments': 0,
             'avg_length': 0,
@@ -51,25 +54,25 @@ def analyze_curve_segments(curve: List[Tuple[float, float]], target_length: floa
             'segment_lengths': []
         }
     
-    avg_length = round(sum(segment_lengths) / len(segment_lengths), 2)
-    min_length = min(segment_lengths)
-    max_length = max(segment_lengths)
+    avg_length = round(float(lengths.mean()), 2)
+    min_length = float(lengths.min())
+    max_length = float(lengths.max())
     
     # Calculate standard deviation
-    variance = sum((length - avg_length) ** 2 for length in segment_lengths) / len(segment_lengths)
+    variance = float(((lengths - avg_length) ** 2).mean())
     std_dev = round(math.sqrt(variance), 2)
     
     # Calculate accuracy as percentage
     accuracy_percent = round((1 - abs(avg_length - target_length) / target_length) * 100, 2)
     
     return {
-        'num_segments': len(segment_lengths),
+        'num_segments': len(lengths),
         'avg_length': avg_length,
         'min_length': min_length,
         'max_length': max_length,
         'std_dev': std_dev,
         'accuracy_percent': accuracy_percent,
-        'segment_lengths': segment_lengths
+        'segment_lengths': lengths.tolist()
     }
 
 def get_segment_lengths(curve: List[Tuple[float, float]]) -> List[float]:
@@ -88,11 +91,14 @@ def get_segment_lengths(curve: List[Tuple[float, float]]) -> List[float]:
     if len(curve) < 2:
         return []
     
-    segment_lengths = []
-    for i in range(len(curve) - 1):
-        p1 = curve[i]
-        p2 = curve[i + 1]
-        length = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-        segment_lengths.append(round(length, 2))
+    return np.round(_segment_lengths_array(curve), 2).tolist()
+
+def _segment_lengths_array(curve: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Unrounded segment lengths as an array.
     
-    return segment_lengths
+    Date: 2026-10-15
+    Description: Distances between consecutive points, computed in one vectorized pass.
+    """
+    deltas = np.diff(np.asarray(curve, dtype=np.float64).reshape(-1, 2), axis=0)
+    return np.hypot(deltas[:, 0], deltas[:, 1])
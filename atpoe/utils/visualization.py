@@ -4,10 +4,33 @@ Description: Visualization utility functions for polygon testing
 """
 
 import math
+import os
+from functools import lru_cache
 from pathlib import Path
+
+import numpy as np
 from lxml import etree
 COORD_DECIMALS = 2
 
+# Inner polygons with more points than this are plotted with a stride so the SVG size stays bounded
+MAX_PLOTTED_POINTS = 5000
+
+# Bound format of a "x,y" coordinate pair with COORD_DECIMALS places, parsed once at import
+_format_pair = f"{{:.{COORD_DECIMALS}f}},{{:.{COORD_DECIMALS}f}}".format
+
+# Per-segment diagnostic prints in validate_direction_continuity
+_DEBUG = False
+
+# Set ATPOE_PNG to also render the success visualization as a PNG with matplotlib
+_SAVE_PNG = bool(os.environ.get("ATPOE_PNG"))
+
+# Attribute sets shared by both visualizations, passed as **kwargs so only positions vary per element
+_GRID_STYLE = {"stroke": "#f0f0f0", "stroke_width": "0.5", "fill": "none"}
+_OUTER_POLYGON_STYLE = {"fill": "none", "stroke": "blue", "stroke_width": "2", "opacity": "0.7"}
+
+# Shapes referencing the vertex marker get a red dot drawn by the renderer at every vertex
+_VERTEX_MARKER_STYLE = {"marker-start": "url(#vertex)", "marker-mid": "url(#vertex)"}
+
 
 
 def validate_direction_continuity(unique_points, max_turn_angle=30.0):
@@ -22,31 +45,37 @@ def validate_direction_continuity(unique_points, max_turn_angle=30.0):
     Returns:
         bool: True if all segments have reasonable turn angles
     """
-    for i in range(1, len(unique_points) - 1):
-        prev_point = unique_points[i - 1]
-        curr_point = unique_points[i]
-        next_point = unique_points[i + 1]
-
-        # Calculate direction vectors
-        vec_prev_x = curr_point[0] - prev_point[0]
-        vec_prev_y = curr_point[1] - prev_point[1]
-        vec_curr_x = next_point[0] - curr_point[0]
-        vec_curr_y = next_point[1] - curr_point[1]
-
-        # Calculate angles
-        prev_angle = math.degrees(math.atan2(vec_prev_y, vec_prev_x))
-        curr_angle = math.degrees(math.atan2(vec_curr_y, vec_curr_x))
-
-        # Calculate turn angle (handle angle wrapping)
-        turn_angle = abs(curr_angle - prev_angle)
-        if turn_angle > 180:
-            turn_angle = 360 - turn_angle
-
-        print(f"  Segment {i}: {prev_point} -> {curr_point} -> {next_point}, turn_angle = {turn_angle:.1f}°")
-
-        # Assert that turn angle is reasonable (should be < max_turn_angle degrees for very smooth curves)
-        # Allow some flexibility for pathological cases
-        assert turn_angle < max_turn_angle, (
+    points = np.asarray(unique_points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 3:
+        return True
+
+    # Turn between consecutive segments from their dot and cross products
+    vectors = np.diff(points, axis=0)
+    incoming = vectors[:-1]
+    outgoing = vectors[1:]
+    dot = incoming[:, 0] * outgoing[:, 0] + incoming[:, 1] * outgoing[:, 1]
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+
+    if _DEBUG:
+        # One write for the whole report instead of one print per segment
+        turn_angles = np.degrees(np.arctan2(np.abs(cross), dot))
+        print("\n".join(f"  Segment {i}: {unique_points[i - 1]} -> {unique_points[i]} -> {unique_points[i + 1]}, turn_angle = {turn_angle:.1f}°"
+                        for i, turn_angle in enumerate(turn_angles.tolist(), start=1)))
+
+    # Turn angles never exceed 180°
+    if max_turn_angle > 180:
+        return True
+
+    # Assert that turn angle is reasonable (should be < max_turn_angle degrees for very smooth curves)
+    # Allow some flexibility for pathological cases
+    # turn < max_turn_angle exactly when dot > cos(max_turn_angle) * |incoming| * |outgoing|
+    cos_threshold = math.cos(math.radians(max_turn_angle))
+    lengths = np.sqrt((incoming[:, 0] ** 2 + incoming[:, 1] ** 2) * (outgoing[:, 0] ** 2 + outgoing[:, 1] ** 2))
+    too_sharp = np.flatnonzero(~(dot > cos_threshold * lengths))
+    if len(too_sharp):
+        i = int(too_sharp[0]) + 1
+        turn_angle = math.degrees(math.atan2(abs(cross[i - 1]), dot[i - 1]))
+        raise AssertionError(
             f"Segment {i} has too sharp a turn: "
             f"turn_angle = {turn_angle:.1f}° (should be < {max_turn_angle}°)"
         )
@@ -62,112 +91,182 @@ def format_coordinate(value, decimal_places=2):
     return f"{value:.{decimal_places}f}"
 
 
-def create_success_visualization(outer_polygon, inner_polygon, elapsed_time, segment_length, target_separation):
+def _add_vertex_marker(svg):
+    """
+    Date: 2026-10-15
+    Description: Add the marker definition referenced by _VERTEX_MARKER_STYLE, a red dot in user units
+    """
+    defs = etree.SubElement(svg, "defs")
+    marker = etree.SubElement(defs, "marker", id="vertex", viewBox="-1.5 -1.5 3 3", markerWidth="3", markerHeight="3",
+                              markerUnits="userSpaceOnUse")
+    etree.SubElement(marker, "circle", r="1.5", fill="red", stroke="none")
+
+
+def _format_pairs(points):
+    """
+    Date: 2026-10-15
+    Description: Format points as "x,y" strings with COORD_DECIMALS places, one C-level format call per point
+    """
+    return list(map(_format_pair, *zip(*points))) if len(points) else []
+
+
+def _bounds(*polygons):
+    """
+    Date: 2026-10-15
+    Description: (min_x, min_y, max_x, max_y) over all points of the polygons, without joining the point lists
+    """
+    mins = np.min([np.asarray(polygon).reshape(-1, 2).min(axis=0) for polygon in polygons if len(polygon)], axis=0)
+    maxs = np.max([np.asarray(polygon).reshape(-1, 2).max(axis=0) for polygon in polygons if len(polygon)], axis=0)
+    return (*mins.tolist(), *maxs.tolist())
+
+
+@lru_cache(maxsize=32)
+def _grid_path_data(min_x, max_x, min_y, max_y, grid_size):
+    """
+    Date: 2026-10-15
+    Description: Path data drawing every vertical and horizontal grid line, so the grid is one SVG element.
+    Cached, since repeated runs over the same outer polygon draw the same grid
+    """
+    y1 = format_coordinate(min_y, COORD_DECIMALS)
+    y2 = format_coordinate(max_y, COORD_DECIMALS)
+    x1 = format_coordinate(min_x, COORD_DECIMALS)
+    x2 = format_coordinate(max_x, COORD_DECIMALS)
+    commands = [f"M {format_coordinate(x, COORD_DECIMALS)} {y1} V {y2}"
+                for x in range(int(min_x), int(max_x) + grid_size, grid_size)]
+    commands += [f"M {x1} {format_coordinate(y, COORD_DECIMALS)} H {x2}"
+                 for y in range(int(min_y), int(max_y) + grid_size, grid_size)]
+    return " ".join(commands)
+
+
+def _save_png(png_file, title, captions, outer_polygon, inner_polygon):
+    """
+    Date: 2026-10-15
+    Description: Render the polygons straight to a 1200x1000 PNG with matplotlib's Agg backend
+    """
+    # Imported here so that importing this module does not pay matplotlib's start-up cost
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 10), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    outer = np.asarray(outer_polygon, dtype=np.float64).reshape(-1, 2)
+    closed = np.concatenate([outer, outer[:1]])
+    ax.plot(closed[:, 0], closed[:, 1], color="blue", linewidth=2, alpha=0.7)
+    inner = np.asarray(inner_polygon, dtype=np.float64).reshape(-1, 2)
+    ax.plot(inner[:, 0], inner[:, 1], color="red", linewidth=0.5, marker="o", markersize=1.5)
+    ax.set_title("\n".join([title, *captions]))
+    ax.set_aspect("equal")
+    ax.grid(True, color="#f0f0f0")
+    fig.savefig(png_file)
+
+
+def create_success_visualization(outer_polygon, inner_polygon, elapsed_time, segment_length, target_separation, pretty=False):
     """
     Date: 2025-08-10
-    Description: Create visualization for successful polygon generation using proper XML methods
+    Description: Create visualization for successful polygon generation using proper XML methods.
+    pretty=True writes one indented element per line, for reading the SVG by hand
     """
     # Constants for visualization
     MARGIN = 50
     GRID_SIZE = 100
     FONT_FAMILY = "Arial"
-    SUCCESS_TITLE = "✅ SUCCESS: Fog-Based Polygon Generation"
+    PNG_TITLE = "SUCCESS: Fog-Based Polygon Generation"  # Plain text, as the PNG font may lack the emoji
+    SUCCESS_TITLE = f"✅ {PNG_TITLE}"
     COORD_DECIMALS = 2  # Limit decimal places in SVG coordinates
     
     # Create SVG with proper viewBox and styling
     svg_file = Path("temp", "test_generate_single_inner_polygon.svg")
 
     # Calculate bounding box for proper viewBox
-    all_points = outer_polygon + inner_polygon
-    min_x = min(p[0] for p in all_points) - MARGIN
-    max_x = max(p[0] for p in all_points) + MARGIN
-    min_y = min(p[1] for p in all_points) - MARGIN
-    max_y = max(p[1] for p in all_points) + MARGIN
+    min_x, min_y, max_x, max_y = _bounds(outer_polygon, inner_polygon)
+    min_x -= MARGIN
+    max_x += MARGIN
+    min_y -= MARGIN
+    max_y += MARGIN
     width = max_x - min_x
     height = max_y - min_y
 
-    # Create SVG root element
+    # Create SVG root element; children are made with etree.SubElement(svg, ...) as in create_failure_visualization
     svg = etree.Element("svg", 
                        xmlns="http://www.w3.org/2000/svg",
                        viewBox=f"{min_x} {min_y} {width} {height}")
 
     # Add grid (optional, for reference)
-    for x in range(int(min_x), int(max_x) + GRID_SIZE, GRID_SIZE):
-        etree.SubElement(svg, "line", 
-                        x1=format_coordinate(x, COORD_DECIMALS), y1=format_coordinate(min_y, COORD_DECIMALS), 
-                        x2=format_coordinate(x, COORD_DECIMALS), y2=format_coordinate(max_y, COORD_DECIMALS),
-                        stroke="#f0f0f0", stroke_width="0.5")
-    
-    for y in range(int(min_y), int(max_y) + GRID_SIZE, GRID_SIZE):
-        etree.SubElement(svg, "line", 
-                        x1=format_coordinate(min_x, COORD_DECIMALS), y1=format_coordinate(y, COORD_DECIMALS), 
-                        x2=format_coordinate(max_x, COORD_DECIMALS), y2=format_coordinate(y, COORD_DECIMALS),
-                        stroke="#f0f0f0", stroke_width="0.5")
+    etree.SubElement(svg, "path", d=_grid_path_data(min_x, max_x, min_y, max_y, GRID_SIZE),
+                     **_GRID_STYLE)
 
     # Outer polygon (blue, thin line)
-    outer_coords = " ".join([f"{x},{y}" for x, y in outer_polygon])
+    outer_coords = " ".join(_format_pairs(outer_polygon))
     etree.SubElement(svg, "polygon", 
-                    points=outer_coords,
-                    fill="none", stroke="blue", stroke_width="2", opacity="0.7")
-
-    # Inner polygon (red, very thin line)
-    inner_coords = " ".join([f"{format_coordinate(x, COORD_DECIMALS)},{format_coordinate(y, COORD_DECIMALS)}" for x, y in inner_polygon[:-1]])  # Exclude duplicate start point
+                    points=outer_coords, **_OUTER_POLYGON_STYLE)
+
+    # Very large inner polygons are plotted with every stride-th point only
+    plotted_points = inner_polygon[:-1]  # Exclude duplicate start point
+    stride = max(1, math.ceil(len(plotted_points) / MAX_PLOTTED_POINTS))
+    if stride > 1:
+        plotted_points = plotted_points[::stride]
+
+    # Inner polygon (red, very thin line), with a small marker at each point to show individual segments;
+    # the markers are drawn from one shared definition instead of one circle element per point
+    inner_coords = " ".join(_format_pairs(plotted_points))
+    _add_vertex_marker(svg)
     etree.SubElement(svg, "polygon", 
                     points=inner_coords,
-                    fill="none", stroke="red", stroke_width="0.5")
-    
-    # Add small markers at each point to show individual segments
-    for i, point in enumerate(inner_polygon[:-1]):  # Exclude duplicate start point
-        x, y = point
-        # Small circle marker at each point
-        etree.SubElement(svg, "circle",
-                        cx=format_coordinate(x, COORD_DECIMALS), cy=format_coordinate(y, COORD_DECIMALS), r="1.5",
-                        fill="red", stroke="none")
-        
-        # Add point number for debugging (every 100th point to avoid clutter)
-        if i % 100 == 0:
-            etree.SubElement(svg, "text",
-                            x=format_coordinate(x + 5, COORD_DECIMALS), y=format_coordinate(y - 5, COORD_DECIMALS),
-                            font_family=FONT_FAMILY, font_size="8", fill="red").text = str(i)
+                    fill="none", stroke="red", stroke_width="0.5", **_VERTEX_MARKER_STYLE)
+
+    # Text styles, built once
+    label_style = {"font_family": FONT_FAMILY, "font_size": "8", "fill": "red"}
+    title_style = {"font_family": FONT_FAMILY, "font_size": "16", "fill": "black"}
+    caption_style = {"font_family": FONT_FAMILY, "font_size": "12", "fill": "black"}
+
+    # Add point number for debugging (every 100th plotted point to avoid clutter); only those points are visited
+    for i in range(0, len(plotted_points), 100):
+        x, y = plotted_points[i]
+        etree.SubElement(svg, "text",
+                        x=format_coordinate(x + 5, COORD_DECIMALS), y=format_coordinate(y - 5, COORD_DECIMALS),
+                        **label_style).text = str(i * stride)
 
     # Add title and labels
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 20, COORD_DECIMALS), y=format_coordinate(min_y + 30, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="16", fill="black").text = SUCCESS_TITLE
+                    **title_style).text = SUCCESS_TITLE
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 20, COORD_DECIMALS), y=format_coordinate(min_y + 50, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="black").text = f"Segment Length: {segment_length}, Target Separation: {target_separation}"
+                    **caption_style).text = f"Segment Length: {segment_length}, Target Separation: {target_separation}"
     
+    points_text = f"Points: {len(inner_polygon)}"
+    if stride > 1:
+        points_text += f" (every {stride}th point plotted)"
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 20, COORD_DECIMALS), y=format_coordinate(min_y + 70, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="black").text = f"Execution Time: {elapsed_time:.2f}s, Points: {len(inner_polygon)}"
+                    **caption_style).text = f"Execution Time: {elapsed_time:.2f}s, {points_text}"
 
     # Write SVG to file
     with open(svg_file, "wb") as f:
-        f.write(etree.tostring(svg, pretty_print=True, encoding="utf-8"))
+        f.write(etree.tostring(svg, pretty_print=pretty, encoding="utf-8"))
 
-    # Convert SVG to PNG using a simple approach (if available)
+    # Render the PNG from the point data rather than rasterizing the SVG, only when asked for
     png_file = Path("temp", "test_generate_single_inner_polygon.png")
-    try:
-        # Try to use cairosvg if available for high-quality conversion
-        import cairosvg
-
-        cairosvg.svg2png(url=str(svg_file), write_to=str(png_file), output_width=1200, output_height=1000)
-        print(f"📊 PNG visualization saved to: {png_file} (using cairosvg)")
-    except ImportError:
-        # Fallback: just save SVG and inform user
-        print(f"📊 SVG visualization saved to: {svg_file}")
-        print("💡 To convert to PNG, install cairosvg: pip install cairosvg")
-        print("   Or open the SVG in a browser and save as PNG")
+    if _SAVE_PNG:
+        _save_png(png_file, PNG_TITLE,
+                  [f"Segment Length: {segment_length}, Target Separation: {target_separation}",
+                   f"Execution Time: {elapsed_time:.2f}s, {points_text}"],
+                  outer_polygon, inner_polygon)
+        print(f"📊 PNG visualization saved to: {png_file}")
+    else:
+        print("💡 To also save a PNG, set ATPOE_PNG=1")
 
     print(f"📊 SVG visualization saved to: {svg_file}")
 
 
-def create_failure_visualization(outer_polygon, error_message, elapsed_time, max_points, max_time, segment_length, target_separation):
+def create_failure_visualization(outer_polygon, error_message, elapsed_time, max_points, max_time, segment_length, target_separation,
+                                 pretty=False):
     """
     Date: 2025-08-10
-    Description: Create visualization for failed polygon generation using proper XML methods
+    Description: Create visualization for failed polygon generation using proper XML methods.
+    pretty=True writes one indented element per line, for reading the SVG by hand
     """
     # Constants for visualization
     MARGIN = 50
@@ -181,36 +280,35 @@ def create_failure_visualization(outer_polygon, error_message, elapsed_time, max
     svg_file = Path("temp", "test_generate_single_inner_polygon.svg")
 
     # Calculate bounding box for proper viewBox
-    min_x = min(p[0] for p in outer_polygon) - MARGIN
-    max_x = max(p[0] for p in outer_polygon) + MARGIN
-    min_y = min(p[1] for p in outer_polygon) - MARGIN
-    max_y = max(p[1] for p in outer_polygon) + MARGIN
+    min_x, min_y, max_x, max_y = _bounds(outer_polygon)
+    min_x -= MARGIN
+    max_x += MARGIN
+    min_y -= MARGIN
+    max_y += MARGIN
     width = max_x - min_x
     height = max_y - min_y
 
-    # Create SVG root element
+    # Create SVG root element; every child below is made with etree.SubElement(svg, ...) so it is created
+    # in this document. Building detached elements and appending them across documents is quadratic in
+    # lxml (see lxml's performance notes); use svg.makeelement() if a helper ever needs a detached subtree
     svg = etree.Element("svg", 
                        xmlns="http://www.w3.org/2000/svg",
                        viewBox=f"{min_x} {min_y} {width} {height}")
 
     # Add grid (optional, for reference)
-    for x in range(int(min_x), int(max_x) + GRID_SIZE, GRID_SIZE):
-        etree.SubElement(svg, "line", 
-                        x1=format_coordinate(x, COORD_DECIMALS), y1=format_coordinate(min_y, COORD_DECIMALS), 
-                        x2=format_coordinate(x, COORD_DECIMALS), y2=format_coordinate(max_y, COORD_DECIMALS),
-                        stroke="#f0f0f0", stroke_width="0.5")
-    
-    for y in range(int(min_y), int(max_y) + GRID_SIZE, GRID_SIZE):
-        etree.SubElement(svg, "line", 
-                        x1=format_coordinate(min_x, COORD_DECIMALS), y1=format_coordinate(y, COORD_DECIMALS), 
-                        x2=format_coordinate(max_x, COORD_DECIMALS), y2=format_coordinate(y, COORD_DECIMALS),
-                        stroke="#f0f0f0", stroke_width="0.5")
+    etree.SubElement(svg, "path", d=_grid_path_data(min_x, max_x, min_y, max_y, GRID_SIZE),
+                     **_GRID_STYLE)
 
     # Outer polygon (blue, thin line)
-    outer_coords = " ".join([f"{format_coordinate(x, COORD_DECIMALS)},{format_coordinate(y, COORD_DECIMALS)}" for x, y in outer_polygon])
+    outer_coords = " ".join(_format_pairs(outer_polygon))
     etree.SubElement(svg, "polygon", 
-                    points=outer_coords,
-                    fill="none", stroke="blue", stroke_width="2", opacity="0.7")
+                    points=outer_coords, **_OUTER_POLYGON_STYLE)
+
+    # Text styles, built once
+    error_title_style = {"font_family": FONT_FAMILY, "font_size": "16", "fill": "red"}
+    error_detail_style = {"font_family": FONT_FAMILY, "font_size": "12", "fill": "red"}
+    title_style = {"font_family": FONT_FAMILY, "font_size": "16", "fill": "black"}
+    caption_style = {"font_family": FONT_FAMILY, "font_size": "12", "fill": "black"}
 
     # Add error message box
     etree.SubElement(svg, "rect", 
@@ -220,31 +318,31 @@ def create_failure_visualization(outer_polygon, error_message, elapsed_time, max
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 30, COORD_DECIMALS), y=format_coordinate(min_y + 45, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="16", fill="red").text = f"❌ FAILURE: {error_message}"
+                    **error_title_style).text = f"❌ FAILURE: {error_message}"
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 30, COORD_DECIMALS), y=format_coordinate(min_y + 65, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="red").text = f"Execution Time: {elapsed_time:.2f}s"
+                    **error_detail_style).text = f"Execution Time: {elapsed_time:.2f}s"
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 30, COORD_DECIMALS), y=format_coordinate(min_y + 85, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="red").text = f"Point Limit: {max_points}"
+                    **error_detail_style).text = f"Point Limit: {max_points}"
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 30, COORD_DECIMALS), y=format_coordinate(min_y + 105, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="red").text = f"Time Limit: {max_time}s"
+                    **error_detail_style).text = f"Time Limit: {max_time}s"
 
     # Add title
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 20, COORD_DECIMALS), y=format_coordinate(min_y + 150, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="16", fill="black").text = FAILURE_TITLE
+                    **title_style).text = FAILURE_TITLE
     
     etree.SubElement(svg, "text", 
                     x=format_coordinate(min_x + 20, COORD_DECIMALS), y=format_coordinate(min_y + 170, COORD_DECIMALS),
-                    font_family=FONT_FAMILY, font_size="12", fill="black").text = f"Segment Length: {segment_length}, Target Separation: {target_separation}"
+                    **caption_style).text = f"Segment Length: {segment_length}, Target Separation: {target_separation}"
 
     # Write SVG to file
     with open(svg_file, "wb") as f:
-        f.write(etree.tostring(svg, pretty_print=True, encoding="utf-8"))
+        f.write(etree.tostring(svg, pretty_print=pretty, encoding="utf-8"))
 
     print(f"📊 Failure visualization saved to: {svg_file}")
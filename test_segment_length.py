@@ -4,9 +4,10 @@ Tests the find_next_point_at_distance strategy with pathological cases.
 """
 
 import math
-import random
-from typing import List, Tuple
-from atpoe.segment_algorithm import find_next_point_at_distance
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+from atpoe.segment_algorithm import find_next_points_at_distance
 from atpoe.fog_polygon_generator import is_point_inside_polygon
 
 def test_find_next_point_pathologies():
@@ -39,102 +40,77 @@ def test_find_next_point_pathologies():
     narrow_passages = generate_narrow_passages_curve(center=(500, 500), radius=100)
     test_single_point_placement(narrow_passages, start_point=(450, 500), segment_length=20, distance=15, test_name="Narrow Passages")
 
-def generate_spike_curve(center: Tuple[float, float], radius: float, spike_length: float) -> List[Tuple[float, float]]:
+@lru_cache(maxsize=16)
+def unit_circle_trig(num_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cosines and sines of num_points evenly spaced angles, computed once per point count."""
+    angles = 2 * np.pi * np.arange(num_points) / num_points
+    cos, sin = np.cos(angles), np.sin(angles)
+    # Shared between calls, so keep them read-only
+    cos.setflags(write=False)
+    sin.setflags(write=False)
+    return cos, sin
+
+def polar_curve(center: Tuple[float, float], radii: np.ndarray) -> np.ndarray:
+    """Place one point per radius at evenly spaced angles around the center."""
+    cos, sin = unit_circle_trig(len(radii))
+    return np.column_stack([center[0] + radii * cos, center[1] + radii * sin])
+
+def generate_spike_curve(center: Tuple[float, float], radius: float, spike_length: float) -> np.ndarray:
     """Generate curve with a very sharp spike that could cause issues."""
-    points = []
-    for i in range(10):
-        angle = 2 * math.pi * i / 10
-        if i == 0:  # Create sharp spike
-            r = spike_length
-        else:
-            r = radius
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    radii = np.full(10, float(radius))
+    radii[0] = spike_length  # Create sharp spike
+    return polar_curve(center, radii)
 
-def generate_deep_concave_curve(center: Tuple[float, float], radius: float, depth: float) -> List[Tuple[float, float]]:
+def generate_deep_concave_curve(center: Tuple[float, float], radius: float, depth: float) -> np.ndarray:
     """Generate curve with deep concave sections that might create islands."""
-    points = []
-    for i in range(10):
-        angle = 2 * math.pi * i / 10
-        # Create deep concave in middle section
-        if 0.3 <= (i / 10) <= 0.7:
-            r = depth  # Very deep concave
-        else:
-            r = radius
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    fractions = np.arange(10) / 10
+    # Create deep concave in middle section
+    radii = np.where((0.3 <= fractions) & (fractions <= 0.7), float(depth), float(radius))
+    return polar_curve(center, radii)
 
-def generate_sharp_star_curve(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_sharp_star_curve(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate star with very sharp, long points."""
-    points = []
-    for i in range(num_points * 2):
-        angle = 2 * math.pi * i / (num_points * 2)
-        if i % 2 == 0:
-            r = radius * 2.5  # Very long sharp points
-        else:
-            r = radius * 0.3  # Very deep valleys
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    # Very long sharp points alternating with very deep valleys
+    radii = np.where(np.arange(num_points * 2) % 2 == 0, radius * 2.5, radius * 0.3)
+    return polar_curve(center, radii)
 
-def generate_extreme_irregular_curve(center: Tuple[float, float], radius: float) -> List[Tuple[float, float]]:
+def generate_extreme_irregular_curve(center: Tuple[float, float], radius: float) -> np.ndarray:
     """Generate curve with extreme random variations."""
-    points = []
-    random.seed(123)  # For reproducible tests
-    for i in range(10):
-        angle = 2 * math.pi * i / 10
-        # Extreme variations
-        r = radius * (0.2 + 2.0 * random.random())  # 0.2x to 2.2x radius
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    rng = np.random.default_rng(123)  # Own seeded generator, for reproducible tests
+    # Extreme variations
+    radii = radius * (0.2 + 2.0 * rng.random(10))  # 0.2x to 2.2x radius
+    return polar_curve(center, radii)
 
-def generate_narrow_passages_curve(center: Tuple[float, float], radius: float) -> List[Tuple[float, float]]:
+def generate_narrow_passages_curve(center: Tuple[float, float], radius: float) -> np.ndarray:
     """Generate curve with very narrow passages that might trap the algorithm."""
-    points = []
-    for i in range(12):
-        angle = 2 * math.pi * i / 12
-        # Create narrow passages
-        if i % 3 == 0:
-            r = radius * 1.5  # Wide sections
-        elif i % 3 == 1:
-            r = radius * 0.8  # Medium sections
-        else:
-            r = radius * 0.4  # Very narrow passages
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    # Wide, medium and very narrow sections in turn
+    radii = np.array([radius * 1.5, radius * 0.8, radius * 0.4])[np.arange(12) % 3]
+    return polar_curve(center, radii)
 
-def test_single_point_placement(outer_curve: List[Tuple[float, float]], start_point: Tuple[float, float], 
-                               segment_length: float, distance: float, test_name: str):
+def test_single_point_placement(outer_curve: np.ndarray, start_point: Tuple[float, float], 
+                               segment_length: float, distance: float, test_name: str, verbose: bool = True):
     """Test single point placement for pathological cases."""
-    print(f"Testing {test_name}")
-    print(f"Start point: {start_point}")
-    print(f"Outer curve has {len(outer_curve)} points")
-    
-    # Test multiple directions
-    for direction in [0, math.pi/4, math.pi/2, 3*math.pi/4, math.pi, 5*math.pi/4, 3*math.pi/2, 7*math.pi/4]:
-        next_point = find_next_point_at_distance(
-            start_point, outer_curve, segment_length, distance, direction
-        )
-        
+    # Report lines are collected and written once at the end rather than printed per direction
+    lines = [f"Testing {test_name}",
+             f"Start point: {start_point}",
+             f"Outer curve has {len(outer_curve)} points"]
+    
+    # Test multiple directions, all placed in one batched call
+    directions = [0, math.pi/4, math.pi/2, 3*math.pi/4, math.pi, 5*math.pi/4, 3*math.pi/2, 7*math.pi/4]
+    next_points = find_next_points_at_distance(start_point, outer_curve, segment_length, distance, directions)
+    for direction, next_point in zip(directions, next_points):
         if next_point:
-            actual_distance = math.hypot(next_point[0] - start_point[0], next_point[1] - start_point[1])
-            print(f"  Direction {direction:.2f}: Next point {next_point}, actual distance {actual_distance:.2f}")
+            actual_distance = np.hypot(next_point[0] - start_point[0], next_point[1] - start_point[1])
+            lines.append(f"  Direction {direction:.2f}: Next point {next_point}, actual distance {actual_distance:.2f}")
             
             # Check if point is inside curve
-            # from segment_length_algorithm import is_point_inside_curve
             inside = is_point_inside_polygon(next_point, outer_curve)
-            print(f"    Inside curve: {inside}")
+            lines.append(f"    Inside curve: {inside}")
         else:
-            print(f"  Direction {direction:.2f}: No valid point found")
+            lines.append(f"  Direction {direction:.2f}: No valid point found")
+    
+    if verbose:
+        print("\n".join(lines))
 
 def test_find_next_point_at_distance():
     """Test the find_next_point_at_distance function with various curve shapes."""
@@ -164,106 +140,63 @@ def test_find_next_point_at_distance():
     irregular_curve = generate_test_irregular_curve(center=(500, 500), radius=100, num_points=10)
     test_segment_placement(irregular_curve, segment_length=20, distance=15, test_name="Irregular")
 
-def generate_test_circle(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_test_circle(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate a simple circular test curve."""
-    points = []
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        x = center[0] + radius * math.cos(angle)
-        y = center[1] + radius * math.sin(angle)
-        points.append((x, y))
-    return points
+    return polar_curve(center, np.full(num_points, float(radius)))
 
-def generate_test_pointed_curve(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_test_pointed_curve(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate a pointed curve with sharp angles."""
-    points = []
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        # Add sharp points every 3rd point
-        if i % 3 == 0:
-            r = radius * 1.5  # Sharp outward point
-        else:
-            r = radius * 0.7  # Sharp inward point
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    # Sharp outward point every 3rd point, sharp inward points between
+    radii = np.where(np.arange(num_points) % 3 == 0, radius * 1.5, radius * 0.7)
+    return polar_curve(center, radii)
 
-def generate_test_concave_curve(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_test_concave_curve(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate a very concave curve that might create islands/lakes."""
-    points = []
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        # Create deep concave sections
-        if 0.2 <= (i / num_points) <= 0.4 or 0.6 <= (i / num_points) <= 0.8:
-            r = radius * 0.3  # Deep concave
-        else:
-            r = radius * 1.2  # Convex sections
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    fractions = np.arange(num_points) / num_points
+    # Deep concave sections between convex sections
+    concave = ((0.2 <= fractions) & (fractions <= 0.4)) | ((0.6 <= fractions) & (fractions <= 0.8))
+    radii = np.where(concave, radius * 0.3, radius * 1.2)
+    return polar_curve(center, radii)
 
-def generate_test_star_curve(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_test_star_curve(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate a star-shaped curve with multiple sharp points."""
-    points = []
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        # Create star pattern
-        if i % 2 == 0:
-            r = radius * 1.3  # Star points
-        else:
-            r = radius * 0.5  # Star valleys
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    # Star points alternating with star valleys
+    radii = np.where(np.arange(num_points) % 2 == 0, radius * 1.3, radius * 0.5)
+    return polar_curve(center, radii)
 
-def generate_test_irregular_curve(center: Tuple[float, float], radius: float, num_points: int) -> List[Tuple[float, float]]:
+def generate_test_irregular_curve(center: Tuple[float, float], radius: float, num_points: int) -> np.ndarray:
     """Generate an irregular curve with random perturbations."""
-    points = []
-    random.seed(42)  # For reproducible tests
-    for i in range(num_points):
-        angle = 2 * math.pi * i / num_points
-        # Add random perturbations
-        r = radius * (0.8 + 0.4 * random.random())
-        x = center[0] + r * math.cos(angle)
-        y = center[1] + r * math.sin(angle)
-        points.append((x, y))
-    return points
+    rng = np.random.default_rng(42)  # Own seeded generator, for reproducible tests
+    # Add random perturbations
+    radii = radius * (0.8 + 0.4 * rng.random(num_points))
+    return polar_curve(center, radii)
 
-def test_segment_placement(outer_curve: List[Tuple[float, float]], segment_length: float, distance: float, test_name: str):
+def test_segment_placement(outer_curve: np.ndarray, segment_length: float, distance: float, test_name: str):
     """Test segment placement for a given curve shape."""
     print(f"Testing {test_name} curve with {len(outer_curve)} points")
     print(f"Segment length: {segment_length}, Distance: {distance}")
     
     # Generate new curve using the algorithm
-    new_curve = generate_curve_by_segment_length(outer_curve, segment_length, distance)
+    new_curve = np.asarray(generate_curve_by_segment_length(outer_curve, segment_length, distance),
+                           dtype=np.float64).reshape(-1, 2)
     
-    if new_curve:
+    if len(new_curve):
         print(f"Generated curve with {len(new_curve)} points")
         
         # Calculate actual segment lengths
-        segment_lengths = []
-        for i in range(len(new_curve) - 1):
-            p1 = new_curve[i]
-            p2 = new_curve[i + 1]
-            seg_len = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-            segment_lengths.append(seg_len)
+        segment_lengths = np.linalg.norm(np.diff(new_curve, axis=0), axis=1)
         
         # Calculate statistics
-        avg_length = sum(segment_lengths) / len(segment_lengths)
-        min_length = min(segment_lengths)
-        max_length = max(segment_lengths)
+        avg_length = segment_lengths.mean()
+        min_length = segment_lengths.min()
+        max_length = segment_lengths.max()
         
         print(f"Segment length stats - Avg: {avg_length:.2f}, Min: {min_length:.2f}, Max: {max_length:.2f}")
         print(f"Target segment length: {segment_length}")
         print(f"Accuracy: {abs(avg_length - segment_length) / segment_length * 100:.1f}%")
         
         # Check for closure
-        first_point = new_curve[0]
-        last_point = new_curve[-1]
-        closure_distance = math.hypot(last_point[0] - first_point[0], last_point[1] - first_point[1])
+        closure_distance = np.linalg.norm(new_curve[-1] - new_curve[0])
         print(f"Closure distance: {closure_distance:.2f} (should be < {segment_length})")
         
         # Visual representation (simple ASCII)
@@ -273,21 +206,21 @@ def test_segment_placement(outer_curve: List[Tuple[float, float]], segment_lengt
     else:
         print("Failed to generate curve")
 
-def generate_curve_by_segment_length(outer_curve: List[Tuple[float, float]], segment_length: float, distance: float) -> List[Tuple[float, float]]:
+def generate_curve_by_segment_length(outer_curve: np.ndarray, segment_length: float, distance: float) -> np.ndarray:
     """
     Generate a new curve by proceeding forward by segment length.
     
     Args:
-        outer_curve: The previous curve to follow
+        outer_curve: The previous curve to follow, as an (N, 2) array
         segment_length: Target length between consecutive points
         distance: Distance to maintain from outer curve
     
     Returns:
-        List of points forming the new curve
+        (M, 2) array of points forming the new curve
     """
     # This will be implemented in the main algorithm
     # For now, return a placeholder
-    return []
+    return np.empty((0, 2), dtype=np.float64)
 
 if __name__ == "__main__":
     test_find_next_point_pathologies()
@@ -0,0 +1,67 @@
+"""
+Date: 2026-10-15
+Description: Tests for configuration loading and caching
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from atpoe.config_loader import load_config
+
+
+def test_load_config_returns_cached_instance():
+    """
+    Date: 2026-10-15
+    Description: Repeated loads of an unchanged file return the same Config object
+    """
+    first = load_config()
+    second = load_config()
+    assert first is second, "Unchanged config.yaml should be served from the cache"
+    assert first.get_segment_length_range() == (3, 30), \
+        f"Unexpected segment length range {first.get_segment_length_range()}"
+
+
+def test_load_config_reloads_after_file_change():
+    """
+    Date: 2026-10-15
+    Description: Touching the config file forces a fresh load
+    """
+    config_file = Path("temp", "test_config_cache.yaml")
+    config_file.write_text(Path("config.yaml").read_text())
+    try:
+        first = load_config(str(config_file))
+        stat = os.stat(config_file)
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = load_config(str(config_file))
+        assert first is not second, "Modified config file should not be served from the cache"
+        assert second.get_output_dpi() == 300, f"Unexpected DPI {second.get_output_dpi()}"
+    finally:
+        config_file.unlink()
+
+
+def test_reload_skips_unchanged_file():
+    """
+    Date: 2026-10-15
+    Description: reload() keeps the existing sections when the file mtime is unchanged
+    """
+    config = load_config()
+    output = config.output
+    config.reload()
+    assert config.output is output, "Unchanged config.yaml should not be re-parsed on reload"
+
+
+def test_missing_file_falls_back_to_defaults():
+    """
+    Date: 2026-10-15
+    Description: allow_default=True uses the prebuilt defaults instead of raising
+    """
+    missing = str(Path("temp", "no_such_config.yaml"))
+    with pytest.raises(FileNotFoundError):
+        load_config(missing)
+    config = load_config(missing, allow_default=True)
+    assert config.get_segment_length_range() == (3, 30), \
+        f"Unexpected default segment length range {config.get_segment_length_range()}"
+    assert config.get_tangent_method() == "3_point_average", \
+        f"Unexpected default tangent method {config.get_tangent_method()}"
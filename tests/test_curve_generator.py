@@ -0,0 +1,33 @@
+"""
+Date: 2026-10-15
+Description: Tests for nested curve generation
+"""
+
+import math
+
+import numpy as np
+
+from atpoe.curve_generator import check_curve_inside_outer, generate_nested_curve_simple
+
+
+def _circle(center_x: float, center_y: float, radius: float, num_points: int = 100):
+    """
+    Date: 2026-10-15
+    Description: Closed circle of points for use as an outer curve
+    """
+    return [(center_x + radius * math.cos(2 * math.pi * i / num_points),
+             center_y + radius * math.sin(2 * math.pi * i / num_points))
+            for i in range(num_points + 1)]
+
+
+def test_nested_curve_is_closed_and_inside_outer():
+    """
+    Date: 2026-10-15
+    Description: A nested curve closes on its first point and lies inside the outer circle
+    """
+    outer = _circle(500, 500, 200)
+    curve = generate_nested_curve_simple(outer, 8.0, 1.5, 1.0, 10.0)
+    assert curve.shape[1] == 2, f"Expected (N, 2) points, got shape {curve.shape}"
+    assert np.array_equal(curve[0], curve[-1]), "Nested curve should close on its first point"
+    assert check_curve_inside_outer(curve, outer), "Nested curve should lie inside the outer curve"
+    assert not check_curve_inside_outer(outer, curve), "Outer curve should not lie inside the nested curve"
@@ -3,13 +3,21 @@ Date: 2025-08-10
 Description: Test for generating a single inner polygon using fog-based algorithm
 """
 
+import os
 import time
 import math
+from functools import lru_cache
 
 import numpy as np
 import pytest
 from pathlib import Path
 
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 # from atpoe.curve_generator import generate_initial_circle
 # from atpoe.fog_polygon_generator import generate_initial_circle
 
@@ -35,6 +43,7 @@ def dummy():
 # Bounding polygon function moved from initial_bounding_polygon.py
 R = 500
 
+@lru_cache(maxsize=16)
 def bounding_polygon(centre=(R, R), radius=R, npoints=1000):
     """
     Date: 2024-08-20
@@ -46,16 +55,18 @@ def bounding_polygon(centre=(R, R), radius=R, npoints=1000):
     npoints: int, the number of points to generate
     
     Returns:
-    pts: list of tuples, the points on the circle
+    pts: (npoints, 2) array, the points on the circle; cached, so it is read-only
     """
     theta = np.linspace(0, 2*np.pi, npoints)
-    pts = []
-    for i in range(npoints):
-        x = centre[0] + radius*np.cos(theta[i])
-        y = centre[1] + radius*np.sin(theta[i])
-        pts.append((x, y))
+    pts = np.empty((npoints, 2))
+    pts[:, 0] = centre[0] + radius*np.cos(theta)
+    pts[:, 1] = centre[1] + radius*np.sin(theta)
+    pts.setflags(write=False)
     return pts
 
+# Set ATPOE_DEBUG to print the polygon analysis in generate_circle_and_create_inner_polygon_old
+_DEBUG = bool(os.environ.get("ATPOE_DEBUG"))
+
 # Test parameters
 SEGMENT_LENGTH = 2.0
 TARGET_SEPARATION = 3.0
@@ -69,11 +80,12 @@ NUM_CURVES = 1
 class Point2D:
 
     def __init__(self, xy=None):
-        self.xy = xy
+        # A float array, so normalize and multiply can scale in place even when given a tuple
+        self.xy = None if xy is None else np.array(xy, dtype=np.float64)
 
     def distance(self, point):
         try:
-            return math.hypot(self.xy[0] - point[0], self.xy[1] - point[1])
+            return math.dist(self.xy, point)
         except Exception as e:
             raise ValueError(f"bad distance {self.xy} {point}")
 
@@ -93,27 +105,26 @@ class Point2D:
         return (self.xy[0], -self.xy[1])
 
     def get_hypot(self):
-        if self.xy:
+        if self.xy is not None:
             return math.hypot(self.xy[0], self.xy[1])
         return None
 
     def normalize(self):
-        if not self.xy:
+        if self.xy is None:
             return
-        try:
-            hypot = self.get_hypot()
-            self.xy[0] /= hypot
-            self.xy[1] /= hypot
-        except Exception as ve:
-            raise ValueError(f"cannot normalize {self}")
+        # A zero vector stays zero rather than dividing by zero
+        hypot = self.get_hypot()
+        inv = 1.0 / hypot if hypot > 1e-12 else 0.0
+        self.xy[0] *= inv
+        self.xy[1] *= inv
 
     def multiply(self, factor: float):
-        if self.xy and factor:
+        if self.xy is not None and factor:
             self.xy[0] *= factor
             self.xy[1] *= factor
 
     def plus(self, point):
-        if self.xy and type(point) is Point2D:
+        if self.xy is not None and type(point) is Point2D:
             return Point2D((self.xy[0] + point[0], self.xy[1] + point[1]))
         return None
 
@@ -124,42 +135,44 @@ class PolygonGenerator:
 
         self.radius = radius
         self.center_pt = Point2D((500, 500)) if center_pt is None else center_pt
-        self.polygon_xy = []
+        self.polygon_xy = np.empty((0, 2))
         self.curve_separation = curve_separation
         self.segment_length = segment_length
         self.window = window
         self.outer_polygon = None
         self.inner_polygon = None
         self.start_idx = start_idx
+        self._outer_kdt = None
+        self._tangents = None
 
     def get_new_point_from_tangent(self, start_idx):
-        tangent = self.get_crude_tangent(self.outer_polygon, start_idx)
-        normal = Point2D((tangent[1], -tangent[0])).normalize() # check
-        start_point = self.outer_polygon[start_idx]
-        new_point = Point2D(start_point).plus(normal.multiply(self.curve_separation))
-        return new_point
-
-    def generate_initial_circle(center: Point2D, radius: float, num_points: int = 50):
-        """Generate initial circular curve with fewer points to prevent hanging."""
-        points = []
-        for i in range(num_points):
-            angle = 2 * math.pi * i / num_points
-            x = center[0] + radius * math.cos(angle)
-            y = center[1] + radius * math.sin(angle)
-            point = Point2D((x, y))
-            points.append(point)
-        return points, y
+        if self._tangents is not None:
+            tangent = self._tangents[start_idx]
+        else:
+            tangent = self.get_crude_tangent(self.outer_polygon, start_idx, self.window)
+        # (dy, -dx) of the backward tangent is the inward normal of an anticlockwise polygon
+        normal = np.array([tangent[1], -tangent[0]]) / np.linalg.norm(tangent)
+        return self.outer_polygon[start_idx] + normal * self.curve_separation
+
+    @lru_cache(maxsize=16)
+    def generate_initial_circle(center, radius: float, num_points: int = 50):
+        """Generate initial circular curve as a read-only (num_points, 2) array, cached per arguments."""
+        angles = 2 * np.pi * np.arange(num_points) / num_points
+        points = np.empty((num_points, 2))
+        points[:, 0] = center[0] + radius * np.cos(angles)
+        points[:, 1] = center[1] + radius * np.sin(angles)
+        points.setflags(write=False)
+        return points
 
     def get_closest_point(self, current_point):
         """very crude - just to test"""
-        min_dist = 999
-        min_idx = -1
-        for i, point in enumerate(self.outer_polygon):
-            dist = current_point.get_dist(point)
-            if dist < min_dist:
-                min_dist = dist
-                min_idx = i
-        return min_idx, min_dist
+        xy = current_point.xy if isinstance(current_point, Point2D) else current_point
+        if self._outer_kdt is not None:
+            min_dist, min_idx = self._outer_kdt.query((xy[0], xy[1]), k=1)
+            return int(min_idx), float(min_dist)
+        dists = np.hypot(self.outer_polygon[:, 0] - xy[0], self.outer_polygon[:, 1] - xy[1])
+        min_idx = int(np.argmin(dists))
+        return min_idx, float(dists[min_idx])
 
 
 
@@ -193,6 +206,10 @@ class PolygonGenerator:
         """
         self.outer_polygon = PolygonGenerator.generate_initial_circle(center=(R, R), radius=R,
                                                 num_points=npoints)
+        if SCIPY_AVAILABLE:
+            # Built once so each get_closest_point is a tree query, not a scan of outer_polygon
+            self._outer_kdt = cKDTree(self.outer_polygon)
+        self._tangents = PolygonGenerator.compute_all_tangents(self.outer_polygon, self.window)
         start_idx = 0
         start_point = self.get_new_point_from_tangent(start_idx)
 
@@ -203,10 +220,17 @@ class PolygonGenerator:
         takes average slope of ipoint[-window]...ipoint[window]
         :return: (dx, dy)
         """
-        lowpt = Point2D(points[ipoint - window])
-        high = (ipoint + window) % len(points)
-        highpt = Point2D(points[high])
-        return highpt.get_vector(lowpt)
+        points = np.asarray(points)
+        return points[ipoint - window] - points[(ipoint + window) % len(points)]
+
+    @classmethod
+    def compute_all_tangents(cls, points, window=2):
+        """
+        gets get_crude_tangent for every point in one pass
+        :return: (N, 2) array of (dx, dy)
+        """
+        points = np.asarray(points)
+        return np.roll(points, window, axis=0) - np.roll(points, -window, axis=0)
 
 
 def test_generate_single_inner_polygon_500_1000(R=500, npoints=1000):
@@ -216,7 +240,22 @@ def test_generate_single_inner_polygon_500_1000(R=500, npoints=1000):
 
     """
     polygon_generator = PolygonGenerator()
-    polygon_generator.generate_circle_and_create_inner_polygon(R, npoints)
+    polygon_generator.generate_circle_and_create_inner_polygon(npoints)
+    outer_polygon = polygon_generator.outer_polygon
+    
+    # The outer polygon is the circle of radius R centred on (R, R)
+    assert outer_polygon.shape == (npoints, 2)
+    assert np.hypot(outer_polygon[:, 0] - R, outer_polygon[:, 1] - R) == pytest.approx(np.full(npoints, R))
+    
+    # The start point is curve_separation inside the outer polygon, opposite its first point
+    start_point = tuple(polygon_generator.get_new_point_from_tangent(0).tolist())
+    assert is_point_inside_polygon(start_point, outer_polygon), f"Start point {start_point} is outside outer polygon"
+    assert calculate_distance_to_polygon(start_point, outer_polygon) == pytest.approx(
+        polygon_generator.curve_separation, abs=0.01)
+    
+    closest_idx, closest_dist = polygon_generator.get_closest_point(start_point)
+    assert closest_idx == 0
+    assert closest_dist == pytest.approx(polygon_generator.curve_separation)
 
 
 def generate_circle_and_create_inner_polygon_old(R, npoints, max_closure=10):
@@ -250,103 +289,114 @@ def generate_circle_and_create_inner_polygon_old(R, npoints, max_closure=10):
         print(f"🔍 DEBUG: unique_points length: {len(unique_points)}")
         print(f"🔍 DEBUG: elapsed_time: {elapsed_time}")
         
-        # ENHANCED DEBUGGING: Show polygon analysis
-        print("\n" + "="*80)
-        print("🔍 POLYGON ANALYSIS DEBUG")
-        print("="*80)
+        # ENHANCED DEBUGGING: Show polygon analysis, only when ATPOE_DEBUG is set
+        if _DEBUG:
+            print("\n" + "="*80)
+            print("🔍 POLYGON ANALYSIS DEBUG")
+            print("="*80)
+        
+            # 1. Initial point analysis
+            print(f"📍 INITIAL POINT: {inner_polygon[0]}")
+            print(f"   Distance from outer boundary: {calculate_distance_to_polygon(inner_polygon[0], outer_polygon):.2f}")
         
-        # 1. Initial point analysis
-        print(f"📍 INITIAL POINT: {inner_polygon[0]}")
-        print(f"   Distance from outer boundary: {calculate_distance_to_polygon(inner_polygon[0], outer_polygon):.2f}")
+            # Segment vectors and lengths, computed once for the analyses below
+            inner_array = np.asarray(inner_polygon, dtype=np.float64).reshape(-1, 2)
+            segment_deltas = np.diff(inner_array, axis=0)
+            segment_lengths = np.hypot(segment_deltas[:, 0], segment_deltas[:, 1])
         
-        # 2. Direction analysis for first few segments
-        print(f"\n🧭 DIRECTION ANALYSIS (first 5 segments):")
-        for i in range(min(5, len(inner_polygon)-1)):
-            p1 = inner_polygon[i]
-            p2 = inner_polygon[i+1]
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            angle = math.degrees(math.atan2(dy, dx))
-            distance = math.hypot(dx, dy)
-            print(f"   Segment {i+1}: {p1} → {p2}")
-            print(f"     Direction: ({dx:.2f}, {dy:.2f}), Angle: {angle:.1f}°, Distance: {distance:.2f}")
+            # 2. Direction analysis for first few segments
+            print(f"\n🧭 DIRECTION ANALYSIS (first 5 segments):")
+            for i in range(min(5, len(inner_polygon)-1)):
+                p1 = inner_polygon[i]
+                p2 = inner_polygon[i+1]
+                dx = p2[0] - p1[0]
+                dy = p2[1] - p1[1]
+                angle = math.degrees(math.atan2(dy, dx))
+                distance = segment_lengths[i]
+                print(f"   Segment {i+1}: {p1} → {p2}")
+                print(f"     Direction: ({dx:.2f}, {dy:.2f}), Angle: {angle:.1f}°, Distance: {distance:.2f}")
         
-        # 3. Closure segment analysis
-        print(f"\n🔗 CLOSURE SEGMENT ANALYSIS:")
-        last_point = inner_polygon[-2]  # Second to last (last is duplicate of first)
-        first_point = inner_polygon[0]
-        closure_dx = first_point[0] - last_point[0]
-        closure_dy = first_point[1] - last_point[1]
-        closure_distance = math.hypot(closure_dx, closure_dy)
-        closure_angle = math.degrees(math.atan2(closure_dy, closure_dx))
-        print(f"   Last point: {last_point}")
-        print(f"   First point: {first_point}")
-        print(f"   Closure vector: ({closure_dx:.2f}, {closure_dy:.2f})")
-        print(f"   Closure distance: {closure_distance:.2f}")
-        print(f"   Closure angle: {closure_angle:.1f}°")
+            # 3. Closure segment analysis
+            print(f"\n🔗 CLOSURE SEGMENT ANALYSIS:")
+            last_point = inner_polygon[-2]  # Second to last (last is duplicate of first)
+            first_point = inner_polygon[0]
+            closure_dx = first_point[0] - last_point[0]
+            closure_dy = first_point[1] - last_point[1]
+            closure_distance = math.dist(last_point, first_point)
+            closure_angle = math.degrees(math.atan2(closure_dy, closure_dx))
+            print(f"   Last point: {last_point}")
+            print(f"   First point: {first_point}")
+            print(f"   Closure vector: ({closure_dx:.2f}, {closure_dy:.2f})")
+            print(f"   Closure distance: {closure_distance:.2f}")
+            print(f"   Closure angle: {closure_angle:.1f}°")
         
-        # 4. What happens at the end analysis
-        print(f"\n🎯 END OF POLYGON ANALYSIS:")
-        print(f"   Total points: {len(inner_polygon)}")
-        print(f"   Unique points: {len(unique_points)}")
-        print(f"   Last 5 points before closure:")
-        for i in range(max(0, len(inner_polygon)-6), len(inner_polygon)-1):
-            p = inner_polygon[i]
-            separation = calculate_distance_to_polygon(p, outer_polygon)
-            print(f"     Point {i+1}: {p}, separation: {separation:.2f}")
+            # 4. What happens at the end analysis
+            print(f"\n🎯 END OF POLYGON ANALYSIS:")
+            print(f"   Total points: {len(inner_polygon)}")
+            print(f"   Unique points: {len(unique_points)}")
+            print(f"   Last 5 points before closure:")
+            for i in range(max(0, len(inner_polygon)-6), len(inner_polygon)-1):
+                p = inner_polygon[i]
+                separation = calculate_distance_to_polygon(p, outer_polygon)
+                print(f"     Point {i+1}: {p}, separation: {separation:.2f}")
         
-        # 5. Check for the huge jump
-        print(f"\n🚨 HUGE JUMP DETECTION:")
-        max_jump = 0
-        jump_start = None
-        jump_end = None
-        jump_index = None
+            # 5. Check for the huge jump
+            print(f"\n🚨 HUGE JUMP DETECTION:")
+            max_jump = 0
+            jump_start = None
+            jump_end = None
+            jump_index = None
         
-        for i in range(len(inner_polygon)-1):
-            p1 = inner_polygon[i]
-            p2 = inner_polygon[i+1]
-            jump_distance = math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-            if jump_distance > max_jump:
-                max_jump = jump_distance
-                jump_start = p1
-                jump_end = p2
-                jump_index = i
+            if segment_lengths.size and segment_lengths.max() > 0:
+                jump_index = int(np.argmax(segment_lengths))
+                max_jump = float(segment_lengths[jump_index])
+                jump_start = inner_polygon[jump_index]
+                jump_end = inner_polygon[jump_index+1]
         
-        print(f"   Maximum jump: {max_jump:.2f} units")
-        print(f"   From: {jump_start}")
-        print(f"   To: {jump_end}")
-        print(f"   At index: {jump_index}")
+            print(f"   Maximum jump: {max_jump:.2f} units")
+            print(f"   From: {jump_start}")
+            print(f"   To: {jump_end}")
+            print(f"   At index: {jump_index}")
         
-        if max_jump > SEGMENT_LENGTH * 10:  # More than 10x segment length
-            print(f"   ⚠️  WARNING: HUGE JUMP DETECTED!")
-            print(f"      This jump is {max_jump/SEGMENT_LENGTH:.1f}x the segment length")
+            # Largest few jumps, found in O(n) with argpartition and then sorted largest first
+            top_k = min(5, segment_lengths.size)
+            if top_k:
+                largest = np.argpartition(segment_lengths, -top_k)[-top_k:]
+                largest = largest[np.argsort(segment_lengths[largest])[::-1]]
+                print(f"   Largest {top_k} jumps:")
+                for j in largest.tolist():
+                    print(f"     [{j}] {inner_polygon[j]} → {inner_polygon[j+1]} ({segment_lengths[j]:.2f})")
+        
+            if max_jump > SEGMENT_LENGTH * 10:  # More than 10x segment length
+                print(f"   ⚠️  WARNING: HUGE JUMP DETECTED!")
+                print(f"      This jump is {max_jump/SEGMENT_LENGTH:.1f}x the segment length")
             
-            # Show context around the huge jump
-            if jump_index is not None:
-                print(f"\n🔍 CONTEXT AROUND HUGE JUMP (index {jump_index}):")
-                start_idx = max(0, jump_index - 3)
-                end_idx = min(len(inner_polygon), jump_index + 4)
+                # Show context around the huge jump
+                if jump_index is not None:
+                    print(f"\n🔍 CONTEXT AROUND HUGE JUMP (index {jump_index}):")
+                    start_idx = max(0, jump_index - 3)
+                    end_idx = min(len(inner_polygon), jump_index + 4)
                 
-                for j in range(start_idx, end_idx):
-                    if j == jump_index:
-                        print(f"   [{j}] {inner_polygon[j]} → {inner_polygon[j+1]} ← HUGE JUMP ({max_jump:.2f})")
-                    elif j < len(inner_polygon) - 1:
-                        dist = math.hypot(inner_polygon[j+1][0] - inner_polygon[j][0], 
-                                        inner_polygon[j+1][1] - inner_polygon[j][1])
-                        print(f"   [{j}] {inner_polygon[j]} → {inner_polygon[j+1]} ({dist:.2f})")
-                    else:
-                        print(f"   [{j}] {inner_polygon[j]}")
+                    for j in range(start_idx, end_idx):
+                        if j == jump_index:
+                            print(f"   [{j}] {inner_polygon[j]} → {inner_polygon[j+1]} ← HUGE JUMP ({max_jump:.2f})")
+                        elif j < len(inner_polygon) - 1:
+                            dist = segment_lengths[j]
+                            print(f"   [{j}] {inner_polygon[j]} → {inner_polygon[j+1]} ({dist:.2f})")
+                        else:
+                            print(f"   [{j}] {inner_polygon[j]}")
         
-        print("="*80 + "\n")
+            print("="*80 + "\n")
         
         # Verify all inner polygon points are inside outer polygon
-        assert validate_inner_polygon_containment(outer_polygon, inner_polygon), f"Inner polygon points are inside outer polygon"
+        _inner_points_are_within_outer(outer_polygon, inner_polygon)
         
         # Debug: print polygon details
-        print(f"DEBUG: Inner polygon has {len(inner_polygon)} points")
-        print(f"DEBUG: First 3 points: {inner_polygon[:3]}")
-        print(f"DEBUG: Last 3 points: {inner_polygon[-3:]}")
-        print(f"DEBUG: Unique points: {len(unique_points)}")
+        if _DEBUG:
+            print(f"DEBUG: Inner polygon has {len(inner_polygon)} points")
+            print(f"DEBUG: First 3 points: {inner_polygon[:3]}")
+            print(f"DEBUG: Last 3 points: {inner_polygon[-3:]}")
+            print(f"DEBUG: Unique points: {len(unique_points)}")
         
         # Test: Ensure first and second points have approximately equal separation from outer curve
         is_valid, first_separation, second_separation, separation_tolerance = validate_point_separations(
@@ -404,5 +454,8 @@ def generate_circle_and_create_inner_polygon_old(R, npoints, max_closure=10):
 
 
 def _inner_points_are_within_outer(outer_polygon, inner_polygon):
-    for point in inner_polygon:
-        assert is_point_inside_polygon(point, outer_polygon), f"Point {point} is outside outer polygon"
+    """
+    Date: 2026-10-15
+    Description: Assert that every inner polygon point is inside the outer polygon, using the library's batched check
+    """
+    assert validate_inner_polygon_containment(outer_polygon, inner_polygon), "Inner polygon has points outside outer polygon"
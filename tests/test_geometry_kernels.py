@@ -0,0 +1,125 @@
+"""
+Date: 2026-10-15
+Description: Tests pinning the compiled geometry kernels to the pure-Python and Shapely paths,
+and the boundary rule shared by segments_intersect in both generators
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+import atpoe.fog_polygon_generator as fog
+from atpoe import segment_algorithm
+
+
+def _star(num_points: int = 40, outer_radius: float = 100, inner_radius: float = 50):
+    """
+    Date: 2026-10-15
+    Description: Star polygon about (500, 500), alternating between two radii
+    """
+    return [(500 + (outer_radius if i % 2 else inner_radius) * math.cos(2 * math.pi * i / num_points),
+             500 + (outer_radius if i % 2 else inner_radius) * math.sin(2 * math.pi * i / num_points))
+            for i in range(num_points)]
+
+
+def _random_radius_polygon(seed: int, num_points: int = 60):
+    """
+    Date: 2026-10-15
+    Description: Star-shaped polygon about (500, 500) with seeded random radii between 60 and 120
+    """
+    radii = np.random.default_rng(seed).uniform(60, 120, num_points)
+    return [(500 + r * math.cos(2 * math.pi * i / num_points), 500 + r * math.sin(2 * math.pi * i / num_points))
+            for i, r in enumerate(radii.tolist())]
+
+
+POLYGONS = {
+    "circle": [(500 + 100 * math.cos(2 * math.pi * i / 200), 500 + 100 * math.sin(2 * math.pi * i / 200))
+               for i in range(200)],
+    "star": _star(),
+    "random_1": _random_radius_polygon(1),
+    "random_2": _random_radius_polygon(2),
+}
+
+
+def _candidate_steps(seed: int, count: int = 200):
+    """
+    Date: 2026-10-15
+    Description: Seeded step start and end points spread over and around the test polygons
+    """
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(380, 620, 2)
+    ends = rng.uniform(380, 620, (count, 2))
+    return (float(start[0]), float(start[1])), ends[:, 0].copy(), ends[:, 1].copy()
+
+
+@pytest.mark.parametrize("name", list(POLYGONS))
+@pytest.mark.parametrize("shapely_path", [False, True])
+def test_fused_kernel_matches_reference_paths(monkeypatch, name, shapely_path):
+    """
+    Date: 2026-10-15
+    Description: Inside, separation and crossing results of the fused candidate kernel agree with the
+    pure-Python fallbacks and with the Shapely path
+    """
+    if shapely_path and not fog.SHAPELY_AVAILABLE:
+        pytest.skip("Shapely 2 not available")
+    polygon = POLYGONS[name]
+    (ax, ay), bxs, bys = _candidate_steps(seed=len(name))
+    signed_separations, crosses = fog._eval_candidates_numba(*fog._polygon_edges(polygon), ax, ay, bxs, bys)
+
+    # Reference answers from the non-compiled paths only
+    monkeypatch.setattr(fog, "NUMBA_AVAILABLE", False)
+    monkeypatch.setattr(fog, "SHAPELY_AVAILABLE", shapely_path)
+    for k, end in enumerate(zip(bxs.tolist(), bys.tolist())):
+        assert bool(crosses[k]) == fog.would_segment_cross_polygon((ax, ay), end, polygon), \
+            f"Crossing differs for step {(ax, ay)} -> {end}"
+        if crosses[k]:
+            continue  # The kernel exits early on a crossing, so its separation is partial
+        assert (signed_separations[k] > 0) == fog.is_point_inside_polygon(end, polygon), \
+            f"Inside test differs for {end}"
+        assert abs(signed_separations[k]) == pytest.approx(fog.calculate_distance_to_polygon(end, polygon),
+                                                           rel=1e-9, abs=1e-9), \
+            f"Separation differs for {end}"
+
+
+# (p1, p2, p3, p4, expected): only proper crossings count
+SEGMENT_CASES = {
+    "proper_crossing": ((0, 0), (10, 10), (0, 10), (10, 0), True),
+    "disjoint": ((0, 0), (1, 1), (5, 5), (6, 7), False),
+    "endpoint_touches_interior": ((0, 0), (5, 5), (0, 10), (10, 0), False),
+    "shared_endpoint": ((0, 0), (5, 5), (5, 5), (10, 0), False),
+    "through_vertex": ((0, 0), (10, 10), (5, 5), (10, 0), False),
+    "collinear_overlap": ((0, 0), (6, 0), (4, 0), (10, 0), False),
+    "parallel": ((0, 0), (10, 0), (0, 1), (10, 1), False),
+}
+
+
+@pytest.mark.parametrize("segments_intersect", [fog.segments_intersect, segment_algorithm.segments_intersect],
+                         ids=["fog_polygon_generator", "segment_algorithm"])
+@pytest.mark.parametrize("case", list(SEGMENT_CASES))
+def test_segments_intersect_boundary_rule(segments_intersect, case):
+    """
+    Date: 2026-10-15
+    Description: Touching, passing through a vertex and collinear overlap are not intersections,
+    in either order of the segments
+    """
+    p1, p2, p3, p4, expected = SEGMENT_CASES[case]
+    assert segments_intersect(p1, p2, p3, p4) is expected
+    assert segments_intersect(p3, p4, p1, p2) is expected
+
+
+@pytest.mark.parametrize("shapely_path", [False, True])
+def test_would_segment_cross_polygon_boundary_rule(monkeypatch, shapely_path):
+    """
+    Date: 2026-10-15
+    Description: A step across an edge crosses the polygon; steps ending on an edge, passing through a
+    vertex or running along an edge do not
+    """
+    if shapely_path and not fog.SHAPELY_AVAILABLE:
+        pytest.skip("Shapely 2 not available")
+    monkeypatch.setattr(fog, "SHAPELY_AVAILABLE", shapely_path)
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert fog.would_segment_cross_polygon((5, 5), (15, 5), square)
+    assert not fog.would_segment_cross_polygon((5, 5), (10, 5), square)
+    assert not fog.would_segment_cross_polygon((12, -2), (-2, 12), square)
+    assert not fog.would_segment_cross_polygon((2, 0), (8, 0), square)
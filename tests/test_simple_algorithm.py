@@ -4,44 +4,74 @@ Description: Tests for the simple polygon generation algorithm
 """
 
 import math
-import matplotlib.pyplot as plt
+import os
 import numpy as np
 import pytest
 
+# Set ATPOE_SHOW to open the plots in a window; otherwise they are only saved, with the Agg backend
+_SHOW = bool(os.environ.get("ATPOE_SHOW"))
+
+def _pyplot():
+    """
+    Date: 2026-10-15
+    Description: Import pyplot on first use, switching to the headless Agg backend unless plots are shown
+    """
+    import matplotlib
+    if not _SHOW:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def _finish_plot(plt):
+    """
+    Date: 2026-10-15
+    Description: Show the current figure if ATPOE_SHOW is set, otherwise close it
+    """
+    if _SHOW:
+        plt.show()
+    else:
+        plt.close()
+
+def _polygon_xy(radius: float, npoints: int) -> np.ndarray:
+    """
+    Date: 2026-10-15
+    Description: Vertices of a regular polygon as an (npoints, 2) array
+    """
+    angles = 2 * np.pi * np.arange(npoints) / npoints
+    return np.stack([radius * np.cos(angles), radius * np.sin(angles)], axis=1)
+
+# Closed 64-gon on the unit circle, scaled and shifted to draw the curve separation
+_CIRCLE_XY = np.concatenate([_polygon_xy(1.0, 64), _polygon_xy(1.0, 1)])
+
 def create_polygon(radius: float, npoints: int) -> list:
     """
     Date: 2025-08-10
     Description: Create a regular polygon with given radius and number of points
     """
-    points = []
-    for i in range(npoints):
-        angle = 2 * math.pi * i / npoints
-        x = radius * math.cos(angle)
-        y = radius * math.sin(angle)
-        points.append((x, y))
-    return points
+    return list(map(tuple, _polygon_xy(radius, npoints).tolist()))
 
 def plot_polygon(polygon: list, title: str = "Polygon"):
     """
     Date: 2025-08-10
     Description: Plot a polygon for visualization
     """
+    # Imported here so that tests which do not plot skip matplotlib's import cost
+    plt = _pyplot()
+
     # Close the polygon by adding first point at end
-    closed_polygon = polygon + [polygon[0]]
-    
-    x_coords = [p[0] for p in closed_polygon]
-    y_coords = [p[1] for p in closed_polygon]
+    points = np.asarray(polygon, dtype=np.float64)
+    closed_polygon = np.concatenate([points, points[:1]])
     
     plt.figure(figsize=(8, 8))
-    plt.plot(x_coords, y_coords, 'b-', linewidth=2)
-    plt.plot([p[0] for p in polygon], [p[1] for p in polygon], 'ro', markersize=6)
+    plt.plot(closed_polygon[:, 0], closed_polygon[:, 1], 'b-', linewidth=2)
+    plt.plot(points[:, 0], points[:, 1], 'ro', markersize=6)
     plt.grid(True, alpha=0.3)
     plt.title(title)
     plt.xlabel('X')
     plt.ylabel('Y')
     plt.axis('equal')
     plt.savefig('temp/step1_polygon.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    _finish_plot(plt)
     print(f"Plot saved to temp/step1_polygon.png")
 
 def create_start_point(polygon: list, curve_separation: float) -> tuple:
@@ -83,15 +113,15 @@ def plot_start_point(polygon: list, start_point: tuple, curve_separation: float,
     Date: 2025-08-10
     Description: Plot polygon with start point
     """
+    plt = _pyplot()
+
     # Close the polygon by adding first point at end
-    closed_polygon = polygon + [polygon[0]]
-    
-    x_coords = [p[0] for p in closed_polygon]
-    y_coords = [p[1] for p in closed_polygon]
+    points = np.asarray(polygon, dtype=np.float64)
+    closed_polygon = np.concatenate([points, points[:1]])
     
     plt.figure(figsize=(8, 8))
-    plt.plot(x_coords, y_coords, 'b-', linewidth=2, label='Outer Polygon')
-    plt.plot([p[0] for p in polygon], [p[1] for p in polygon], 'ro', markersize=6, label='Polygon Points')
+    plt.plot(closed_polygon[:, 0], closed_polygon[:, 1], 'b-', linewidth=2, label='Outer Polygon')
+    plt.plot(points[:, 0], points[:, 1], 'ro', markersize=6, label='Polygon Points')
     
     # Plot start point
     if start_point:
@@ -102,10 +132,10 @@ def plot_start_point(polygon: list, start_point: tuple, curve_separation: float,
                  start_point[0] - polygon[0][0], start_point[1] - polygon[0][1],
                  head_width=0.5, head_length=0.5, fc='green', ec='green', alpha=0.7)
         
-        # Draw circle showing curve_separation
-        circle = plt.Circle(polygon[0], curve_separation, fill=False, color='green', 
-                          linestyle='--', alpha=0.5, label=f'Curve Separation: {curve_separation}')
-        plt.gca().add_patch(circle)
+        # Draw circle showing curve_separation, as a plain polyline rather than a Circle patch
+        circle = points[0] + curve_separation * _CIRCLE_XY
+        plt.plot(circle[:, 0], circle[:, 1], color='green', linestyle='--', alpha=0.5,
+                 label=f'Curve Separation: {curve_separation}')
     
     plt.grid(True, alpha=0.3)
     plt.title(title)
@@ -114,7 +144,7 @@ def plot_start_point(polygon: list, start_point: tuple, curve_separation: float,
     plt.axis('equal')
     plt.legend()
     plt.savefig('temp/step2_start_point.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    _finish_plot(plt)
     print(f"Plot saved to temp/step2_start_point.png")
 
 if __name__ == "__main__":